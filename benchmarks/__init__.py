@@ -0,0 +1 @@
+"""Offline performance benchmarks; run each one with ``python -m benchmarks.<name>``."""
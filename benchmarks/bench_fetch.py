@@ -0,0 +1,113 @@
+"""Fetch throughput against the local ranking stub at several concurrency limits.
+
+    python -m benchmarks.bench_fetch [--roster-size 10000] [--participants 30000]
+                                     [--latency 0.02] [--fail-rate 0.02]
+
+A synthetic ranking is written for a generated roster and served by
+``benchmarks.ranking_stub`` with the given per-request latency and failure
+rate.  Each concurrency limit then fetches the whole contest from scratch;
+the table reports wall time, pages per second, retries and connections
+opened, and every run's output is checked against the synthetic ranking.
+Finally a run is interrupted half way and resumed from its checkpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks import ranking_stub
+from dashboard import fetch
+
+CONTEST = 'w999'
+
+
+def _roster(path, size):
+    pd.DataFrame({
+        'Name': [f'Student {i}' for i in range(size)],
+        'Reg Number': [f'24XX{i:05d}' for i in range(size)],
+        'Username': [f'student_{i}' for i in range(size)],
+        'Year': 'II', 'Department': 'CSE', 'Domain': 'SDE',
+    }).to_csv(path, index=False)
+
+
+def _expected(pages_dir):
+    directory = os.path.join(pages_dir, fetch.slug(CONTEST))
+    ranks = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), encoding='utf-8') as file:
+            for username, rank, _, _ in fetch.parse_page(json.load(file)):
+                ranks[username] = rank
+    return ranks
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _check(target, expected):
+    frame = pd.read_csv(target, dtype={'Username': str})
+    got = dict(zip(frame['Username'], frame['Rank']))
+    return all(got[username] == expected.get(username, 0) for username in got)
+
+
+def run(roster_size, participants, latency, fail_rate, levels):
+    with tempfile.TemporaryDirectory() as work:
+        roster = os.path.join(work, 'roster.csv')
+        pages_dir = os.path.join(work, 'pages')
+        _roster(roster, roster_size)
+        usernames = [f'student_{i}' for i in range(roster_size)]
+        pages = ranking_stub.synthesize(usernames, CONTEST, pages_dir, participants)
+        expected = _expected(pages_dir)
+        server = ranking_stub.serve(pages_dir, latency=latency, fail_rate=fail_rate)
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        print(f'{roster_size} roster users, {pages} ranking pages, {latency * 1000:.0f} ms latency, '
+              f'{fail_rate:.0%} failures')
+        print(f'{"concurrency":>11} {"seconds":>8} {"pages/s":>8} {"retries":>8} {"connections":>12} {"ok":>4}')
+        for concurrency in levels:
+            out = os.path.join(work, f'out-{concurrency}')
+            os.makedirs(out)
+            start = time.perf_counter()
+            target, fetcher = fetch.fetch(roster, CONTEST, out, base_url, concurrency)
+            elapsed = time.perf_counter() - start
+            print(f'{concurrency:>11} {elapsed:>8.2f} {pages / elapsed:>8.1f} {fetcher.retried:>8} '
+                  f'{fetcher.pool.opened:>12} {"yes" if _check(target, expected) else "NO":>4}')
+
+        # Resume: stop after roughly half of the pages, then start again.
+        out = os.path.join(work, 'out-resume')
+        os.makedirs(out)
+        checkpoint = fetch.Checkpoint(os.path.join(out, f'.{CONTEST}.fetch.jsonl'))
+
+        def stop_half_way(done, total):
+            if done >= total // 2:
+                raise _Interrupted
+
+        try:
+            asyncio.run(fetch.Fetcher(base_url, max(levels)).ranking(CONTEST, checkpoint, stop_half_way))
+        except _Interrupted:
+            pass
+        checkpoint.close()
+        done = len(fetch.Checkpoint(os.path.join(out, f'.{CONTEST}.fetch.jsonl')).pages)
+        before = server.requests
+        target, _ = fetch.fetch(roster, CONTEST, out, base_url, max(levels))
+        print(f'resume: {done} pages checkpointed, {server.requests - before} requests to finish, '
+              f'output {"ok" if _check(target, expected) else "WRONG"}')
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--roster-size', type=int, default=10000)
+    parser.add_argument('--participants', type=int, default=30000)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--fail-rate', type=float, default=0.02)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+    run(args.roster_size, args.participants, args.latency, args.fail_rate, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Per-interaction rerun latency with and without fragment-scoped reruns.
+
+    python -m benchmarks.bench_fragments [--repeat 10] [--url http://localhost:8501]
+
+Starts the app headless (or uses ``--url``) and, over one browser-like
+session, changes each widget that lives in an ``st.fragment`` back and forth
+``--repeat`` times.  Each change is timed twice: as the browser now sends it
+(only the fragment reruns) and as a whole-page rerun, which is what every
+interaction cost before the pages had fragments.  The table reports the
+median of each and the speed-up.  A sidebar filter, which still reruns the
+whole page, is listed for reference.
+"""
+import argparse
+import asyncio
+import statistics
+
+from benchmarks import session
+
+# (page, widget label, two values to alternate between)
+INTERACTIONS = [
+    ('Best Performers', 'Top, How Many?', (10, 200)),
+    ('Best Performers', 'Find Student', ('an', 'ar')),
+    ('Best Performers', 'Year', ('III', 'All')),
+    ('Absentees', 'Name', ('k', 'ra')),
+    ('Absentees', 'Absentees per Page', (250, 50)),
+    ('Download Dashboard', 'Format', ('SVG', 'PNG')),
+    ('Download Dashboard', 'Resolution (DPI)', (300, 500)),
+    ('Student Trends', 'Find Student', ('an', 'ar')),
+    ('Compare Contests', 'Students per List', (50, 10)),
+]
+
+
+async def _measure(url, repeat):
+    results = []
+    async with session.Session(url) as browser:
+        page = None
+        for page_name, label, values in INTERACTIONS:
+            if page_name != page:
+                page = page_name
+                await browser.open(page)
+            fragment_id = browser.widgets[label].fragment_id
+            timings = {'fragment': [], 'app': []}
+            for i in range(repeat):
+                value = values[i % 2]
+                timings['fragment'].append(await browser.set(label, value))
+                timings['app'].append(await browser.set(label, values[(i + 1) % 2], scope='app'))
+            results.append((page_name, label, bool(fragment_id),
+                            statistics.median(timings['app']), statistics.median(timings['fragment'])))
+        if browser.errors:
+            raise session.SessionError('; '.join(browser.errors))
+    return results
+
+
+def run(url, repeat):
+    server = None
+    if url is None:
+        server, url = session.start_server()
+    try:
+        # One untimed pass loads every contest and builds every cache.
+        asyncio.run(_measure(url, 1))
+        results = asyncio.run(_measure(url, repeat))
+    finally:
+        if server is not None:
+            server.kill()
+
+    print(f'{"page":<20} {"interaction":<20} {"whole page ms":>14} {"fragment ms":>12} {"speed-up":>9}')
+    for page, label, in_fragment, app, fragment in results:
+        scoped = f'{fragment * 1000:>12.1f} {app / fragment:>8.1f}x' if in_fragment else f'{"-":>12} {"-":>9}'
+        print(f'{page:<20} {label:<20} {app * 1000:>14.1f} {scoped}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--url', help='a running dashboard (default: start one)')
+    args = parser.parse_args()
+    run(args.url, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
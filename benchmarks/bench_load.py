@@ -0,0 +1,173 @@
+"""Rerun latency, throughput and server memory as concurrent sessions grow.
+
+    python -m benchmarks.bench_load [--sessions 1,5,10,25] [--duration 30] [--think 0.5]
+                                    [--warm] [--url http://localhost:8501 --pid PID]
+
+Starts the app headless (through ``serve.py`` with ``--warm``) or uses
+``--url``.  For each session count in turn that many browser-like sessions
+(``benchmarks.session``) connect at once.  For ``--duration`` seconds each
+one keeps visiting pages the way a student does right after results come
+out: open a page, pick a contest, narrow the sidebar filters, then work the
+page's own widgets (top N, absentee search, a 500-DPI image) and download
+what it offers.  Between steps it thinks for a random 0-2x ``--think``
+seconds.
+
+Each level reports how many reruns and downloads completed and their p50/p99
+latency, the completed interactions per second, and the server's resident
+memory (``VmRSS``) idle before the level and at its peak.  The growth is not
+all per session: renders and caches the warm-up did not reach fill up during
+the first levels, and the allocator seldom hands memory back, so compare
+the peaks across levels.  Memory needs the server's pid: known when the
+tool starts it, ``--pid`` otherwise.  Run it on generated data (``benchmarks.synthetic``)
+with ``CONTEST_DATA_DIR``, which the started server inherits.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from benchmarks import session
+
+DOWNLOAD = 'download'
+# Stands for a random one of the widget's options.
+ANY = object()
+
+# (page, [(widget label or DOWNLOAD, value or button label)])
+VISITS = [
+    ('Dashboard', [('Select Contest Name', ANY), ('Year', ANY), ('Department', ANY)]),
+    ('Best Performers', [('Select Contest Name', ANY), ('Year', ANY), ('Top, How Many?', 100),
+                         ('Find Student', 'an')]),
+    ('Absentees', [('Select Contest Name', ANY), ('Department', ANY), ('Name', 'ra'),
+                   ('Absentees per Page', 100), (DOWNLOAD, 'Download Absentee data')]),
+    ('Download Dashboard', [('Select Contest Name', ANY), ('Year', ANY), ('Format', 'PNG'),
+                            ('Resolution (DPI)', 500), (DOWNLOAD, 'Download Dashboard')]),
+    ('Student Trends', [('Year', ANY), ('Find Student', 'an')]),
+    ('Compare Contests', [('Department', ANY), ('Students per List', 25)]),
+]
+
+
+def rss(pid):
+    """Resident memory of process ``pid`` in bytes."""
+    with open(f'/proc/{pid}/status', encoding='ascii') as file:
+        for line in file:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    raise ValueError(f'no VmRSS for pid {pid}')
+
+
+async def _sample(pid, peak, stop):
+    while not stop.is_set():
+        peak[0] = max(peak[0], rss(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.25)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _visitor(url, deadline, think, seed, timings, errors):
+    rng = random.Random(seed)
+    async with session.Session(url) as browser:
+        while time.monotonic() < deadline:
+            page, steps = VISITS[rng.randrange(len(VISITS))]
+            try:
+                timings['rerun'].append(await browser.open(page))
+                for label, value in steps:
+                    await asyncio.sleep(rng.uniform(0, 2 * think))
+                    if time.monotonic() >= deadline:
+                        break
+                    if label == DOWNLOAD:
+                        timings['download'].append(await browser.download(value))
+                        continue
+                    if value is ANY:
+                        value = rng.choice(list(browser.widget(label).proto.options))
+                    timings['rerun'].append(await browser.set(label, value))
+            except session.SessionError as error:
+                errors.append(str(error))
+        errors.extend(browser.errors)
+
+
+async def _level(url, pid, sessions, duration, think):
+    timings = {'rerun': [], 'download': []}
+    errors = []
+    idle = rss(pid) if pid else None
+    peak, stop = [idle or 0], asyncio.Event()
+    sampler = asyncio.create_task(_sample(pid, peak, stop)) if pid else None
+    start = time.monotonic()
+    deadline = start + duration
+    await asyncio.gather(*(_visitor(url, deadline, think, i, timings, errors) for i in range(sessions)))
+    elapsed = time.monotonic() - start
+    stop.set()
+    if sampler:
+        await sampler
+    return {
+        'sessions': sessions,
+        'timings': timings,
+        'errors': errors,
+        'per_second': (len(timings['rerun']) + len(timings['download'])) / elapsed,
+        'idle': idle,
+        'peak': peak[0] if pid else None,
+    }
+
+
+def _ms(values, q):
+    return f'{np.percentile(values, q) * 1000:.0f}' if values else '-'
+
+
+def report(levels):
+    print(f'{"sessions":>8} {"reruns":>7} {"p50 ms":>7} {"p99 ms":>7} {"downloads":>9} {"p50 ms":>7} '
+          f'{"p99 ms":>7} {"per s":>6} {"errors":>6} {"idle MiB":>9} {"peak MiB":>9}')
+    for level in levels:
+        reruns, downloads = level['timings']['rerun'], level['timings']['download']
+        memory = f'{"-":>9} {"-":>9}'
+        if level['peak'] is not None:
+            memory = f'{level["idle"] / 2**20:>9.0f} {level["peak"] / 2**20:>9.0f}'
+        print(f'{level["sessions"]:>8} {len(reruns):>7} {_ms(reruns, 50):>7} {_ms(reruns, 99):>7} '
+              f'{len(downloads):>9} {_ms(downloads, 50):>7} {_ms(downloads, 99):>7} '
+              f'{level["per_second"]:>6.1f} {len(level["errors"]):>6} {memory}')
+    for level in levels:
+        for error in sorted(set(level['errors'])):
+            print(f'error with {level["sessions"]} sessions: {error}')
+
+
+async def _warm_up(url):
+    async with session.Session(url) as browser:
+        for page, _ in VISITS:
+            await browser.open(page)
+            if 'Select Contest Name' in browser.widgets:
+                for contest in browser.widget('Select Contest Name').proto.options:
+                    await browser.set('Select Contest Name', contest)
+
+
+def run(sessions, duration, think, url=None, pid=None, warm=False):
+    server = None
+    if url is None:
+        server, url = session.start_server(warm=warm)
+        pid = server.pid
+    try:
+        # Untimed, every page visits every contest, so the levels' memory is
+        # what the sessions add rather than the shared caches filling up.
+        asyncio.run(_warm_up(url))
+        levels = [asyncio.run(_level(url, pid, count, duration, think)) for count in sessions]
+    finally:
+        if server is not None:
+            server.kill()
+    report(levels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', default='1,5,10,25', help='comma-separated session counts')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per session count')
+    parser.add_argument('--think', type=float, default=0.5, help='mean pause between steps, in seconds')
+    parser.add_argument('--warm', action='store_true', help='start through serve.py, with the cache warm-up')
+    parser.add_argument('--url', help='a running dashboard (default: start one)')
+    parser.add_argument('--pid', type=int, help='pid of the --url server, to report its memory')
+    args = parser.parse_args()
+    run([int(count) for count in args.sessions.split(',')], args.duration, args.think,
+        args.url, args.pid, args.warm)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""Page latency and memory per scripted interaction, checked against a baseline.
+
+    python -m benchmarks.bench_pages [--repeat 3] [--out bench_pages.json]
+                                     [--baseline benchmarks/baselines/pages.<host>.json]
+                                     [--save-baseline]
+                                     [--tolerance 0.25] [--page Absentees]
+
+Every page is driven headlessly with ``streamlit.testing.v1.AppTest`` through
+a scripted sequence of what users do on it: open it, switch contest, cascade
+Year -> Department -> Domain, set the top N, page through and search
+absentees, pick an image format and trigger the downloads.  A download step
+runs what the click runs on the server (the button's deferred callable).
+
+Each sequence runs ``--repeat`` times in one process against a fresh cache
+directory (the bundled CSVs are ingested into it up front): the first pass
+is cold, building the page's in-memory caches, the rest are warm and the
+fastest of them is kept, as the least disturbed by whatever else the machine
+is doing.  Peak memory per step (``tracemalloc``, the growth over the step's
+start) comes from one extra warm pass, since tracing slows everything down.
+AppTest reruns the whole page for every interaction, so the savings of
+fragment-scoped reruns show in ``bench_fragments`` instead.
+
+Results are written as JSON.  With a baseline, any step whose warm time or
+peak memory exceeds the baseline's by more than ``--tolerance`` (and by
+more than a small absolute floor, to ignore noise) is reported and the exit
+status is 1.
+
+Timings only compare on the machine that produced them, so baselines are
+not shipped: ``--save-baseline`` writes one per host under
+``benchmarks/baselines/`` (ignored by git), named after ``platform.node()``.
+Save one on the machine that checks for regressions, before the change under
+test; a baseline recorded on another host is refused rather than compared.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', f'pages.{platform.node() or "local"}.json')
+
+# Regressions smaller than these are noise, whatever the ratio.
+MIN_SECONDS = 0.05
+MIN_BYTES = 2 * 2**20
+
+
+def _second(options):
+    # The first option other than 'All'.
+    return next(option for option in options if option != 'All')
+
+
+def _first_three(options):
+    return options[:3]
+
+
+def _scenarios(newest, oldest):
+    """(page script, [(step, action, label, value)]); values may pick from the widget's options."""
+    cascade = [
+        ('Year', 'select', 'Year', 'III'),
+        ('Department', 'select', 'Department', _second),
+        ('Domain', 'select', 'Domain', _second),
+    ]
+    return {
+        'Dashboard': ('1_📊_Dashboard.py', [
+            ('switch contest', 'select', 'Select Contest Name', oldest),
+            *cascade,
+            ('all contests', 'select', 'Select Contest Name', 'All Contests'),
+            ('back to newest', 'select', 'Select Contest Name', newest),
+        ]),
+        'Best Performers': ('pages/2_⭐_Best Performers.py', [
+            ('switch contest', 'select', 'Select Contest Name', oldest),
+            ('top N', 'number', 'Top, How Many?', 100),
+            ('page 2', 'number', 'Page', 2),
+            *cascade,
+            ('find student', 'text', 'Find Student', 'an'),
+        ]),
+        'Absentees': ('pages/3_❌_Absentees.py', [
+            ('switch contest', 'select', 'Select Contest Name', oldest),
+            ('Year', 'select', 'Year', 'III'),
+            ('page 2', 'number', 'Page', 2),
+            ('page size', 'select', 'Absentees per Page', 100),
+            ('name search', 'text', 'Name', 'ra'),
+            ('download CSV', 'download', 'Download Absentee data', None),
+            ('chronic', 'toggle', 'Chronic Absentees', True),
+            ('last N', 'number', 'Absent in the Last N Contests', 8),
+            ('download chronic CSV', 'download', 'Download Chronic Absentee data', None),
+        ]),
+        'Download Dashboard': ('pages/4_⬇️_Download_Dashboard.py', [
+            ('switch contest', 'select', 'Select Contest Name', oldest),
+            ('Department', 'select', 'Department', _second),
+            ('Year', 'select', 'Year', 'III'),
+            ('download PNG', 'download', 'Download Dashboard', None),
+            ('SVG', 'radio', 'Format', 'svg'),
+            ('download SVG', 'download', 'Download Dashboard', None),
+        ]),
+        'Student Trends': ('pages/5_📈_Student_Trends.py', [
+            ('last N', 'number', 'Last N Contests', 6),
+            ('Year', 'select', 'Year', 'III'),
+            ('find student', 'text', 'Find Student', 'an'),
+        ]),
+        'Compare Contests': ('pages/6_⚖️_Compare_Contests.py', [
+            ('three contests', 'multiselect', 'Contests', _first_three),
+            ('Department', 'select', 'Department', _second),
+            ('list length', 'number', 'Students per List', 25),
+        ]),
+    }
+
+
+@contextlib.contextmanager
+def _capture_downloads(callables):
+    # Remember the callables behind deferred download buttons, by file id, so
+    # a step can run what clicking the button runs.
+    from streamlit.runtime.media_file_manager import MediaFileManager
+
+    add_deferred = MediaFileManager.add_deferred
+
+    def capture(self, callable, *args, **kwargs):
+        file_id = add_deferred(self, callable, *args, **kwargs)
+        callables[file_id] = callable
+        return file_id
+
+    MediaFileManager.add_deferred = capture
+    try:
+        yield
+    finally:
+        MediaFileManager.add_deferred = add_deferred
+
+
+def _widget(app, kind, label):
+    for widget in app.get(kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f'no {kind} labelled {label!r}')
+
+
+def _act(app, action, label, value, downloads):
+    if action == 'download':
+        data = downloads[_widget(app, 'download_button', label).proto.deferred_file_id]()
+        if not len(data):
+            raise AssertionError(f'{label!r} produced an empty file')
+        return app
+    kind = {'select': 'selectbox', 'number': 'number_input', 'text': 'text_input', 'toggle': 'toggle',
+            'radio': 'radio', 'multiselect': 'multiselect'}[action]
+    widget = _widget(app, kind, label)
+    if callable(value):
+        value = value(widget.options)
+    if action == 'text':
+        return widget.input(value).run()
+    return widget.set_value(value).run()
+
+
+def _pass(script, steps, downloads, memory=False):
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+
+    def measure(name, step):
+        if memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        app = step()
+        seconds = time.perf_counter() - start
+        if app.exception:
+            raise AssertionError(f'{script}: {name}: {app.exception[0].value}')
+        peak = tracemalloc.get_traced_memory()[1] - before if memory else None
+        results.append((name, seconds, peak))
+        return app
+
+    app = measure('open', lambda: AppTest.from_file(os.path.join(ROOT, script), default_timeout=120).run())
+    for name, action, label, value in steps:
+        app = measure(name, lambda: _act(app, action, label, value, downloads))
+    return results
+
+
+def run(repeat, pages=None):
+    """Run every scenario; returns the results document."""
+    cache_dir = tempfile.mkdtemp(prefix='bench-pages-')
+    # Read when dashboard.registry is first imported, i.e. below.
+    os.environ['CONTEST_CACHE_DIR'] = cache_dir
+    os.environ.setdefault('DASHBOARD_PERF_LOG', '')
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    from dashboard import registry
+
+    document = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'host': platform.node(),
+        'repeat': repeat,
+        'pages': {},
+    }
+    downloads = {}
+    try:
+        contests = registry.discover()
+        scenarios = _scenarios(contests[0].name, contests[-1].name)
+        with _capture_downloads(downloads):
+            for page, (script, steps) in scenarios.items():
+                if pages and page not in pages:
+                    continue
+                timings = [_pass(script, steps, downloads) for _ in range(repeat)]
+                tracemalloc.start()
+                try:
+                    peaks = _pass(script, steps, downloads, memory=True)
+                finally:
+                    tracemalloc.stop()
+                document['pages'][page] = [{
+                    'step': name,
+                    'cold_seconds': round(timings[0][i][1], 4),
+                    'warm_seconds': round(min(timing[i][1] for timing in timings[1:]), 4)
+                    if repeat > 1 else None,
+                    'peak_bytes': peaks[i][2],
+                } for i, (name, _, _) in enumerate(timings[0])]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return document
+
+
+def regressions(document, baseline, tolerance):
+    """Steps slower or hungrier than ``baseline`` by more than ``tolerance``."""
+    found = []
+    for page, steps in document['pages'].items():
+        before = {step['step']: step for step in baseline.get('pages', {}).get(page, [])}
+        for step in steps:
+            old = before.get(step['step'])
+            if old is None:
+                continue
+            for field, floor in (('warm_seconds', MIN_SECONDS), ('peak_bytes', MIN_BYTES)):
+                if step[field] is None or old[field] is None:
+                    continue
+                if step[field] > old[field] * (1 + tolerance) and step[field] - old[field] > floor:
+                    found.append((page, step['step'], field, old[field], step[field]))
+    return found
+
+
+def report(document):
+    print(f'{"page":<20} {"step":<22} {"cold ms":>9} {"warm ms":>9} {"peak MiB":>9}')
+    for page, steps in document['pages'].items():
+        for step in steps:
+            warm = f'{step["warm_seconds"] * 1000:>9.1f}' if step['warm_seconds'] is not None else f'{"-":>9}'
+            print(f'{page:<20} {step["step"]:<22} {step["cold_seconds"] * 1000:>9.1f} {warm} '
+                  f'{step["peak_bytes"] / 2**20:>9.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='passes per page; the first one is cold')
+    parser.add_argument('--out', default='bench_pages.json', help='where to write the results')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown, e.g. 0.25 for 25%%')
+    parser.add_argument('--page', action='append', help='only this page (repeatable)')
+    args = parser.parse_args()
+    args.out = os.path.abspath(args.out)
+
+    document = run(max(args.repeat, 1), args.page)
+    report(document)
+    with open(args.out, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+    print(f'wrote {args.out}')
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+        print(f'saved the baseline to {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get('host') != document['host']:
+            sys.exit(f'{args.baseline} was recorded on {baseline.get("host") or "another host"}; '
+                     'save a baseline on this one with --save-baseline')
+        found = regressions(document, baseline, args.tolerance)
+        for page, step, field, old, new in found:
+            print(f'REGRESSION {page} / {step}: {field} {old} -> {new}')
+        if found:
+            sys.exit(1)
+        print(f'no regressions against {args.baseline} (tolerance {args.tolerance:.0%})')
+    else:
+        print(f'no baseline at {args.baseline}; record one with --save-baseline')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Compare contest load times: raw ``pd.read_csv`` against the columnar store.
+
+    python -m benchmarks.bench_store [--repeat 20]
+
+Every contest is ingested first, then each strategy loads every contest
+``--repeat`` times; the table reports the median per-contest load time and the
+resident size of what was loaded.
+"""
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+from dashboard import ingest, registry, store
+
+DASHBOARD_COLUMNS = ['Name', 'Year', 'Department', 'Domain', 'Rank', 'Score', 'ProbCount']
+
+
+def _strategies():
+    return {
+        'pd.read_csv (all columns)': lambda c: pd.read_csv(c.path),
+        'store (all columns)': lambda c: store.read(c.id),
+        'store (Dashboard columns)': lambda c: store.read(c.id, columns=DASHBOARD_COLUMNS),
+        'store (Dashboard columns, Rank > 0)': lambda c: store.read(
+            c.id, columns=DASHBOARD_COLUMNS, filters=[('Rank', '>', 0)]),
+    }
+
+
+def run(repeat):
+    contests = registry.discover()
+    for contest in contests:
+        ingest.ensure(contest)
+
+    results = []
+    for label, load in _strategies().items():
+        timings, size = [], 0
+        for _ in range(repeat):
+            for contest in contests:
+                start = time.perf_counter()
+                frame = load(contest)
+                timings.append(time.perf_counter() - start)
+                size += frame.memory_usage(deep=True).sum()
+        results.append((label, statistics.median(timings), size / repeat / len(contests)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    baseline = results[0][1]
+    print(f'{"strategy":<40} {"median ms":>10} {"speedup":>8} {"KiB/contest":>12}')
+    for label, median, size in results:
+        print(f'{label:<40} {median * 1000:>10.2f} {baseline / median:>7.1f}x {size / 1024:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Local stand-in for LeetCode's contest ranking API, for offline fetch runs.
+
+    python -m benchmarks.ranking_stub --pages DIR [--port 8765] [--latency 0.02] [--fail-rate 0.02]
+    python -m benchmarks.ranking_stub --pages DIR --synthesize w413 --roster roster.csv [--participants 30000]
+
+Serves ``DIR/<slug>/<page>.json`` at the paths ``dashboard.fetch`` requests,
+over keep-alive HTTP/1.1.  Recorded pages can be dropped into ``DIR``;
+``--synthesize`` writes a made-up ranking instead, in which about 60% of the
+roster's usernames take part among other participants.  ``--latency`` delays
+every response and ``--fail-rate`` answers that share of requests with a 503
+to exercise the fetcher's retries.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from dashboard import fetch
+
+QUESTION_IDS = [3001, 3002, 3003, 3004]
+
+
+def synthesize(usernames, contest_id, pages_dir, participants=None, turnout=0.6, seed=0):
+    """Write a synthetic ranking of ``contest_id`` as recorded pages; returns the page count."""
+    rng = random.Random(seed)
+    taking_part = [username for username in usernames if rng.random() < turnout]
+    participants = max(participants or 0, len(taking_part))
+    everyone = taking_part + [f'anon_{i}' for i in range(participants - len(taking_part))]
+    rng.shuffle(everyone)
+    directory = os.path.join(pages_dir, fetch.slug(contest_id))
+    os.makedirs(directory, exist_ok=True)
+    page_count = max(1, math.ceil(participants / fetch.PAGE_SIZE))
+    for page in range(page_count):
+        entries, submissions = [], []
+        for offset, username in enumerate(everyone[page * fetch.PAGE_SIZE:(page + 1) * fetch.PAGE_SIZE]):
+            rank = page * fetch.PAGE_SIZE + offset + 1
+            # Better ranks solve more problems.
+            solved = max(0, min(4, 4 - int(4 * rank / participants + rng.random())))
+            entries.append({'username': username, 'rank': rank, 'score': [0, 3, 7, 12, 18][solved]})
+            submissions.append({str(qid): {'fail_count': 0} for qid in QUESTION_IDS[:solved]})
+        with open(os.path.join(directory, f'{page + 1}.json'), 'w', encoding='utf-8') as file:
+            json.dump({'user_num': participants, 'total_rank': entries, 'submissions': submissions}, file)
+    return page_count
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+        if server.fail_rate and server.random.random() < server.fail_rate:
+            return self._send(503, b'{}', {'Retry-After': '0'})
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        page = parse_qs(url.query).get('pagination', ['1'])[0]
+        path = os.path.join(server.pages_dir, parts[-1], f'{page}.json')
+        if parts[:3] != ['contest', 'api', 'ranking'] or len(parts) != 4 or not os.path.exists(path):
+            return self._send(404, b'{}')
+        with open(path, 'rb') as file:
+            self._send(200, file.read())
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in dict(headers).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-response (e.g. an interrupted fetch) are expected.
+        pass
+
+
+def serve(pages_dir, port=0, latency=0.0, fail_rate=0.0, seed=0):
+    """Start the stub on a background thread; returns the server (``server_address``, ``shutdown()``)."""
+    server = _Server(('127.0.0.1', port), _Handler)
+    server.pages_dir = pages_dir
+    server.latency = latency
+    server.fail_rate = fail_rate
+    server.random = random.Random(seed)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', required=True, help='directory of recorded ranking pages')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='share of requests answered with 503')
+    parser.add_argument('--synthesize', metavar='CONTEST', help='write a synthetic ranking and exit')
+    parser.add_argument('--roster', help='roster CSV whose usernames take part (with --synthesize)')
+    parser.add_argument('--participants', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.synthesize:
+        if not args.roster:
+            parser.error('--synthesize needs --roster')
+        usernames = pd.read_csv(args.roster, dtype=str)['Username'].dropna().tolist()
+        pages = synthesize(usernames, args.synthesize, args.pages, args.participants)
+        print(f'wrote {pages} pages to {os.path.join(args.pages, fetch.slug(args.synthesize))}')
+        return
+
+    server = serve(args.pages, args.port, args.latency, args.fail_rate)
+    print(f'serving {args.pages} on http://127.0.0.1:{server.server_address[1]} (Ctrl+C to stop)')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
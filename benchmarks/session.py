@@ -0,0 +1,208 @@
+"""A scripted browser session against a running dashboard.
+
+Speaks Streamlit's own websocket protocol (``/_stcore/stream``): every rerun
+request goes out as a ``BackMsg`` carrying the session's widget states, and
+the ``ForwardMsg`` deltas that come back are read until the run finishes.
+Widgets are found by their label.  Setting one reruns what the browser would
+rerun: only the enclosing fragment for a widget inside an ``st.fragment``,
+the whole page otherwise (``scope='app'`` forces a whole-page rerun, as every
+interaction was before the pages had fragments).  ``download`` clicks a
+download button: the server builds a deferred file on request and the
+session then fetches it over HTTP, as the browser does.
+
+``start_server`` runs the app on a free local port for the benchmarks that
+drive it.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, '1_📊_Dashboard.py')
+
+_FINISHED = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY}
+
+
+class SessionError(Exception):
+    pass
+
+
+class Widget:
+
+    def __init__(self, kind, proto, fragment_id):
+        self.kind = kind
+        self.id = proto.id
+        self.label = proto.label
+        self.proto = proto
+        self.fragment_id = fragment_id
+
+    def state(self, value):
+        """The ``WidgetState`` the browser sends for ``value`` (as displayed, for choices)."""
+        state = WidgetState(id=self.id)
+        if self.kind in ('selectbox', 'radio', 'text_input'):
+            state.string_value = str(value)
+        elif self.kind == 'number_input':
+            state.double_value = float(value)
+        elif self.kind == 'checkbox':
+            state.bool_value = bool(value)
+        elif self.kind == 'slider':
+            # st.select_slider; st.slider's numeric values are not used by the pages.
+            state.string_array_value.data.append(str(value))
+        else:
+            raise SessionError(f'{self.label!r}: setting a {self.kind} is not supported')
+        return state
+
+
+class Session:
+
+    def __init__(self, url):
+        self.base_url = url.rstrip('/')
+        self.url = self.base_url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self.pages = {}
+        self.page_hash = ''
+        self.session_id = ''
+        self.widgets = {}
+        self.errors = []
+        self._states = {}
+        self._socket = None
+
+    async def __aenter__(self):
+        self._socket = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._socket.close()
+
+    async def open(self, page=None):
+        """Run a page (by its name or a substring of it; the Dashboard if ``None``); returns seconds."""
+        if page is not None:
+            if not self.pages:
+                await self._rerun()
+            names = [page] if page in self.pages else [name for name in self.pages if page in name]
+            if len(names) != 1:
+                raise SessionError(f'{page!r} matches pages {names}')
+            self.page_hash = self.pages[names[0]]
+        self._states = {}
+        return await self._rerun()
+
+    def widget(self, label):
+        if label not in self.widgets:
+            raise SessionError(f'no widget labelled {label!r} (have {sorted(self.widgets)})')
+        return self.widgets[label]
+
+    async def set(self, label, value, scope='auto'):
+        """Change a widget like a user would and wait for the rerun; returns seconds."""
+        widget = self.widget(label)
+        self._states[widget.id] = widget.state(value)
+        return await self._rerun(widget.fragment_id if scope == 'auto' else '')
+
+    async def download(self, label):
+        """Click a download button and fetch the file; returns seconds."""
+        proto = self.widget(label).proto
+        start = time.perf_counter()
+        path = proto.url
+        if proto.deferred_file_id:
+            message = BackMsg()
+            request = message.backend_operation_request
+            request.request_id = uuid.uuid4().hex
+            request.session_id = self.session_id
+            request.deferred_file.file_id = proto.deferred_file_id
+            await self._socket.send(message.SerializeToString())
+            while True:
+                forward = ForwardMsg()
+                forward.ParseFromString(await self._socket.recv())
+                response = forward.backend_operation_response
+                if forward.WhichOneof('type') == 'backend_operation_response' and \
+                        response.request_id == request.request_id:
+                    break
+            if response.error_msg:
+                raise SessionError(f'{label!r}: {response.error_msg}')
+            path = response.deferred_file.url
+        try:
+            await asyncio.to_thread(_fetch, self.base_url + path)
+        except OSError as error:
+            # Includes a 404 when other sessions' reruns swept the file up first.
+            raise SessionError(f'{label!r}: fetching the file: {error}') from error
+        return time.perf_counter() - start
+
+    async def _rerun(self, fragment_id=''):
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.page_script_hash = self.page_hash
+        client_state.fragment_id = fragment_id
+        client_state.widget_states.widgets.extend(self._states.values())
+        if not fragment_id:
+            self.widgets = {}
+        start = time.perf_counter()
+        await self._socket.send(message.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._socket.recv())
+            kind = forward.WhichOneof('type')
+            if kind == 'new_session':
+                self.session_id = forward.new_session.initialize.session_id
+            elif kind == 'navigation':
+                self.pages = {page.page_name or 'Dashboard': page.page_script_hash
+                              for page in forward.navigation.app_pages}
+            elif kind == 'delta':
+                self._element(forward.delta)
+            elif kind == 'script_finished':
+                if forward.script_finished in _FINISHED:
+                    return time.perf_counter() - start
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise SessionError('the page failed to compile')
+
+    def _element(self, delta):
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            self.errors.append(f'{element.exception.type}: {element.exception.message}')
+            return
+        proto = getattr(element, kind)
+        if getattr(proto, 'id', '') and getattr(proto, 'label', ''):
+            self.widgets[proto.label] = Widget(kind, proto, delta.fragment_id)
+
+
+def _fetch(url):
+    with urllib.request.urlopen(url, timeout=300) as response:
+        return response.read()
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server(warm=False, timeout=60):
+    """Start the app headless on a free port (through ``serve.py`` if ``warm``);
+    returns ``(process, base url)``."""
+    port = _free_port()
+    command = [sys.executable, 'serve.py'] if warm else [sys.executable, '-m', 'streamlit', 'run', DASHBOARD]
+    process = subprocess.Popen(
+        command + ['--server.headless', 'true', '--server.port', str(port),
+                   '--browser.gatherUsageStats', 'false', '--server.fileWatcherType', 'none'],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{url}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise SessionError(f'the server did not come up within {timeout}s')
@@ -0,0 +1,237 @@
+"""Synthetic rosters and contest files at any scale, for load and scale testing.
+
+    python -m benchmarks.synthetic --out DIR [--students 100000] [--contests 100]
+                                   [--departments 11] [--domains 9] [--absent 0.45]
+                                   [--participants N] [--rank-skew 1.0] [--schema both] [--seed 0]
+
+Writes ``w<NNN>.csv`` / ``bw<NNN>.csv`` files into ``DIR`` in either layout
+the real exports use: ``bw130`` (BOM, unnamed index column, ``II year``,
+``FullStack``, ``Mail ID``, ``left empty so replaced``) or ``w412`` (its own
+column order, ``II``, ``Full Stack Development``, no ``Mail ID``); ``both``
+alternates between them.  Point the app at the result with
+``CONTEST_DATA_DIR=DIR``.
+
+Every contest shares one roster.  Each student has a fixed skill, so their
+ranks move together from contest to contest, and a fixed turnout, drawn
+around ``1 - --absent`` so that some students are chronic absentees.  The
+roster's attendees get distinct global ranks out of ``--participants``
+(20 per student by default, about what the bundled contests show);
+``--rank-skew`` above 1 crowds them towards the top of the field, below 1
+towards the bottom.  Departments and domains follow a long-tailed mix;
+domains stop at the ones ingest recognizes.
+
+Everything is drawn with numpy and written with ``pyarrow.csv``, so 100
+contests of 100k students take seconds.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pcsv
+
+from dashboard import ingest
+
+DEPARTMENTS = ['CSE', 'ECE', 'AIDS', 'IT', 'CSBS', 'AIML', 'EEE', 'BME', 'CSE (CS)', 'ECE (VLSI)', 'ECE (ACT)']
+SECTIONS = ['A', 'B', 'C', 'D']
+# Points for 0-4 solved problems.
+SCORES = [0, 3, 7, 12, 18]
+# Share of Section/Domain cells left blank, as in the exports.
+BLANK = 0.01
+
+FIRST_NAMES = ['Aarav', 'Abinaya', 'Arjun', 'Bharath', 'Deepika', 'Dhanush', 'Divya', 'Gokul', 'Harini',
+               'Hari', 'Janani', 'Karthik', 'Keerthana', 'Lakshmi', 'Madhan', 'Meena', 'Naveen', 'Nithya',
+               'Pranav', 'Priya', 'Rahul', 'Raja', 'Sanjay', 'Shruthi', 'Subha', 'Surya', 'Vignesh', 'Yamini']
+LAST_NAMES = ['Anand', 'Bala', 'Chandran', 'Ganesh', 'Kannan', 'Kumar', 'Mani', 'Murugan', 'Prakash',
+              'Raj', 'Raman', 'Sathya', 'Selvam', 'Shankar', 'Srinivasan', 'Venkat']
+
+# Per layout: columns in file order (None is the unnamed index column), and
+# how it spells a year, a domain and a blank cell.
+SCHEMAS = {
+    'bw130': {
+        'columns': [None, 'Name', 'Reg Number', 'Username', 'Year', 'Department', 'Section', 'Domain',
+                    'Mail ID', 'Mobile Number', 'Rank', 'ProbCount', 'Score'],
+        'bom': True,
+        'year': '{} year',
+        'domains': {'Full Stack': 'FullStack'},
+        'departments': {'CSE (CS)': 'Cyber Security'},
+        'blank': 'left empty so replaced',
+    },
+    'w412': {
+        'columns': ['Name', 'Reg Number', 'Year', 'Section', 'Department', 'Domain', 'Mobile Number',
+                    'Username', 'Rank', 'Score', 'ProbCount'],
+        'bom': False,
+        'year': '{}',
+        'domains': {'Full Stack': 'Full Stack Development', 'Data Analytics': 'Data Analytics and Data Science'},
+        'departments': {},
+        'blank': '',
+    },
+}
+
+
+def _long_tail(count):
+    weights = 1 / np.arange(1, count + 1)
+    return weights / weights.sum()
+
+
+def _pick(rng, labels, size, weights=None):
+    """``labels`` drawn ``size`` times, as a dictionary-encoded arrow array."""
+    indices = pa.array(rng.choice(len(labels), size=size, p=weights).astype(np.int32))
+    return pa.DictionaryArray.from_arrays(indices, pa.array(labels))
+
+
+def _digits(values, width):
+    return pc.utf8_lpad(pc.cast(pa.array(values), pa.string()), width, '0')
+
+
+class Roster:
+    """The students every generated contest shares, with their skill and turnout."""
+
+    def __init__(self, students, departments=len(DEPARTMENTS), domains=len(ingest.DOMAINS) - 1,
+                 absent=0.45, seed=0):
+        rng = np.random.default_rng(seed)
+        self.size = students
+        serial = np.arange(students)
+        department_names = DEPARTMENTS[:departments] + [f'DEPT {i + 1}' for i in range(len(DEPARTMENTS), departments)]
+        # 'Other' is left for blank and unrecognized domains.
+        domain_names = [domain for domain in ingest.DOMAINS if domain != 'Other'][:max(domains, 1)]
+
+        self.year = _pick(rng, ingest.YEARS, students, [0.15, 0.4, 0.3, 0.15])
+        self.department = _pick(rng, department_names, students, _long_tail(len(department_names)))
+        self.section = _pick(rng, SECTIONS, students, [0.4, 0.3, 0.2, 0.1])
+        self.domain = _pick(rng, domain_names, students, _long_tail(len(domain_names)))
+        self.name = pc.binary_join_element_wise(
+            _pick(rng, FIRST_NAMES, students).dictionary_decode(),
+            _pick(rng, LAST_NAMES, students).dictionary_decode(),
+            pa.array(np.array(list('ABCDEFGHIJKLMNOPRSTUVY'))[rng.integers(0, 22, students)]),
+            ' ')
+        username = pc.binary_join_element_wise('student_', _digits(serial, 1), '')
+        self.columns = {
+            'Name': self.name,
+            # The batch follows from the year: first years joined in 2025.
+            'Reg Number': pc.binary_join_element_wise(_digits(25 - self.year.indices.to_numpy(), 2), 'SY',
+                                                      _digits(serial, 7), ''),
+            'Username': username,
+            'Mail ID': pc.binary_join_element_wise(username, '@example.edu', ''),
+            'Mobile Number': _digits(rng.integers(6_000_000_000, 10_000_000_000, students), 10),
+        }
+        self.blank = rng.random((2, students)) < BLANK
+
+        self.skill = rng.random(students)
+        absent = min(max(absent, 0.0), 1.0)
+        if 0 < absent < 1:
+            # Mean turnout 1 - absent; a Beta this wide leaves a tail of chronic absentees.
+            self.turnout = rng.beta(2 * (1 - absent), 2 * absent, students)
+        else:
+            self.turnout = np.full(students, 1 - absent)
+
+    def text(self, schema):
+        """The roster's columns as ``schema`` spells them."""
+        layout = SCHEMAS[schema]
+
+        def respell(array, spellings, blank=None):
+            labels = [spellings.get(label, label) for label in array.dictionary.to_pylist()]
+            text = pa.DictionaryArray.from_arrays(array.indices, pa.array(labels)).dictionary_decode()
+            return text if blank is None else pc.if_else(pa.array(blank), layout['blank'], text)
+
+        return {
+            **self.columns,
+            'Year': respell(self.year, {year: layout['year'].format(year) for year in ingest.YEARS}),
+            'Department': respell(self.department, layout['departments']),
+            'Section': respell(self.section, {}, self.blank[0]),
+            'Domain': respell(self.domain, layout['domains'], self.blank[1]),
+        }
+
+
+def results(roster, rng, participants=None, rank_skew=1.0):
+    """One contest's ``(Rank, ProbCount, Score)`` per student; absentees rank 0."""
+    participants = participants or 20 * roster.size
+    attended = np.flatnonzero(rng.random(roster.size) < roster.turnout)
+    # Best first: skill plus this contest's luck.
+    attended = attended[np.argsort(-(roster.skill[attended] + rng.normal(0, 0.15, len(attended))))]
+    count = len(attended)
+
+    positions = np.sort(rng.choice(participants, size=min(count, participants), replace=False))
+    if count > participants:
+        positions = np.concatenate([positions, np.arange(participants, count)])
+    if rank_skew != 1.0:
+        scaled = (participants * (positions / participants) ** rank_skew).astype(np.int64)
+        # Keep ranks distinct after squeezing them together.
+        steps = np.arange(count)
+        positions = np.maximum.accumulate(scaled - steps) + steps
+    rank = np.zeros(roster.size, dtype=np.int64)
+    rank[attended] = positions + 1
+
+    # Better ranks solve more problems, as in benchmarks.ranking_stub.
+    solved = np.zeros(roster.size, dtype=np.int64)
+    field = max(participants, count)
+    solved[attended] = np.clip(4 - (4 * rank[attended] / field + rng.random(count)).astype(np.int64), 0, 4)
+    return rank, solved, np.asarray(SCORES)[solved]
+
+
+def contest_ids(count, first_weekly=413, first_biweekly=137):
+    """``count`` contest ids in release order: two weeklies to every biweekly."""
+    ids = []
+    for i in range(count):
+        ids.append(f'bw{first_biweekly + i // 3}' if i % 3 == 2 else f'w{first_weekly + i - i // 3}')
+    return ids
+
+
+def write_contest(path, roster, schema, rank, solved, score, text=None):
+    """Write one contest file in ``schema``'s layout."""
+    layout = SCHEMAS[schema]
+    columns = {**(text or roster.text(schema)), 'Rank': rank, 'ProbCount': solved, 'Score': score,
+               None: np.arange(roster.size)}
+    table = pa.table({name or '': columns[name] for name in layout['columns']})
+    header = ','.join(name or '' for name in layout['columns']) + '\n'
+    with open(path, 'wb') as file:
+        file.write((('\ufeff' if layout['bom'] else '') + header).encode('utf-8'))
+        pcsv.write_csv(table, file, pcsv.WriteOptions(include_header=False))
+
+
+def generate(out_dir, students=100_000, contests=100, departments=len(DEPARTMENTS),
+             domains=len(ingest.DOMAINS) - 1, absent=0.45, participants=None, rank_skew=1.0,
+             schema='both', seed=0):
+    """Write ``contests`` files for one synthetic roster into ``out_dir``; returns their paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    roster = Roster(students, departments, domains, absent, seed)
+    rng = np.random.default_rng(seed + 1)
+    schemas = list(SCHEMAS) if schema == 'both' else [schema]
+    texts = {name: roster.text(name) for name in schemas}
+    paths = []
+    for i, contest_id in enumerate(contest_ids(contests)):
+        layout = schemas[i % len(schemas)]
+        path = os.path.join(out_dir, f'{contest_id}.csv')
+        write_contest(path, roster, layout, *results(roster, rng, participants, rank_skew), text=texts[layout])
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', required=True, help='directory to write the contest files to')
+    parser.add_argument('--students', type=int, default=100_000)
+    parser.add_argument('--contests', type=int, default=100)
+    parser.add_argument('--departments', type=int, default=len(DEPARTMENTS))
+    parser.add_argument('--domains', type=int, default=len(ingest.DOMAINS) - 1,
+                        help=f'at most {len(ingest.DOMAINS) - 1}, the ones ingest recognizes')
+    parser.add_argument('--absent', type=float, default=0.45, help='share of the roster missing a contest')
+    parser.add_argument('--participants', type=int, help='size of the whole field (default: 20 per student)')
+    parser.add_argument('--rank-skew', type=float, default=1.0,
+                        help='above 1 puts the roster near the top of the field, below 1 near the bottom')
+    parser.add_argument('--schema', choices=[*SCHEMAS, 'both'], default='both')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = generate(args.out, args.students, args.contests, args.departments, args.domains, args.absent,
+                     args.participants, args.rank_skew, args.schema, args.seed)
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f'wrote {len(paths)} contests x {args.students} students ({size / 2**20:.0f} MiB) '
+          f'to {args.out} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Shared data and UI helpers for the LeetCode contest dashboard pages."""
@@ -0,0 +1,83 @@
+"""Absentee lists for the Absentees page: row selection, paging and CSV export.
+
+Absentees are handled as row ids into the shared contest dataset.  The page
+only materializes the rows of the page on screen, and the CSV is written in
+chunks when the download is clicked, then cached per contest and filters.
+
+``chronic`` looks across contests instead, using the presence bitsets of the
+shared ``dashboard.history`` snapshot.
+"""
+import io
+
+import streamlit as st
+
+from dashboard import dataset, filters, history, registry, search
+
+TABLE_COLUMNS = ['Name', 'Year', 'Domain', 'Department', 'Mobile Number']
+PAGE_SIZES = [25, 50, 100, 250]
+CHUNK_ROWS = 2000
+
+
+def rows(contest_data, index, name='', **selection):
+    """Row ids of the absentees under a filter selection and optional search text
+    (matched against name, username and registration number)."""
+    rows = index.rows(**selection)
+    if name:
+        rows = search.for_contest(contest_data.contest_id).rows(name, within=rows)
+    return rows[contest_data.frame['Rank'].to_numpy()[rows] == 0]
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def page(contest_data, rows, number, page_size, columns=TABLE_COLUMNS):
+    """The rows of page ``number`` (1-based), numbered by their position in the list."""
+    start = (number - 1) * page_size
+    frame = contest_data.rows(rows[start:start + page_size], columns=columns, with_pii=True)
+    frame.index = range(start, start + len(frame))
+    return frame
+
+
+@registry.per_contest('absentees', max_entries=32)
+def csv(contest_id, version, year='All', department='All', domain='All', name=''):
+    """The absentee CSV (every column) for a contest given as ``Contest``, id or name,
+    and a filter selection."""
+    contest_data = dataset.for_contest(contest_id)
+    selected = rows(contest_data, filters.for_contest(contest_id), name,
+                    year=year, department=department, domain=domain)
+    buffer = io.StringIO()
+    # One chunk even when empty, so the header is always written.
+    for start in range(0, max(len(selected), 1), CHUNK_ROWS):
+        chunk = contest_data.rows(selected[start:start + CHUNK_ROWS], with_pii=True)
+        chunk.index = range(start, start + len(chunk))
+        chunk.to_csv(buffer, header=start == 0)
+    return buffer.getvalue().encode('utf-8')
+
+
+def chronic(snapshot, rows, last, min_absent, min_streak=0):
+    """Students among ``rows`` of a history snapshot absent from at least ``min_absent`` of
+    the ``last`` contests and currently on a streak of at least ``min_streak`` misses."""
+    presence = snapshot.attendance()
+    absences = presence.absences(last)[rows]
+    streak = presence.streak()[rows]
+    keep = (absences >= min_absent) & (streak >= min_streak)
+    rows = rows[keep]
+    first = presence.first_participation()[rows]
+    frame = snapshot.students.iloc[rows][['Name', 'Username', 'Reg Number', 'Year', 'Department', 'Domain']]
+    frame = frame.assign(**{
+        'Missed': absences[keep],
+        'Listed': presence.listings(last)[rows],
+        'Current Streak': streak[keep],
+        'First Participation': [snapshot.contests[i].name if i >= 0 else 'Never' for i in first],
+    })
+    return frame.sort_values(by=['Missed', 'Current Streak'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def chronic_csv(snapshot_key, last, min_absent, min_streak, year='All', department='All', domain='All'):
+    """The chronic-absentee CSV for one history snapshot, thresholds and filter selection."""
+    # snapshot_key is only part of the cache key: new or changed contests give a new file.
+    snapshot = history.current()
+    rows = snapshot.filter_index().rows(year=year, department=department, domain=domain)
+    return chronic(snapshot, rows, last, min_absent, min_streak).to_csv().encode('utf-8')
@@ -0,0 +1,82 @@
+"""Students x contests presence bitsets and the absence queries built on them.
+
+Bit ``j`` of a student's row stands for contest ``j`` of ``dashboard.history``
+(oldest first), packed little-endian into bytes.  ``listed`` marks the
+contests a student appears in, ``present`` those with ``Rank > 0`` and
+``absent`` is ``listed & ~present``.  Counting absences over any window of
+contests is then an AND with a window mask plus a byte popcount lookup, and
+streaks and first participations come from the highest and lowest set bits.
+"""
+import numpy as np
+
+# Per byte value: set bits, lowest set bit (8 if none) and highest set bit (-1 if none).
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+LOWEST = np.array([(value & -value).bit_length() - 1 if value else 8 for value in range(256)], dtype=np.int16)
+HIGHEST = np.array([value.bit_length() - 1 for value in range(256)], dtype=np.int16)
+
+
+def _pack(matrix):
+    return np.packbits(matrix, axis=1, bitorder='little')
+
+
+class Attendance:
+
+    def __init__(self, listed, present):
+        self.students, self.contests = listed.shape
+        self.listed = _pack(listed)
+        self.present = _pack(present & listed)
+        self.absent = self.listed & ~self.present
+
+    def window(self, last=None):
+        """Packed mask of the ``last`` most recent contests (all if ``None``)."""
+        bits = np.zeros(self.contests, dtype=bool)
+        bits[max(self.contests - last, 0) if last else 0:] = True
+        return np.packbits(bits, bitorder='little')
+
+    @staticmethod
+    def count(bits):
+        """Set bits per row."""
+        return POPCOUNT[bits].sum(axis=1, dtype=np.int32)
+
+    def absences(self, last=None):
+        """Contests missed per student among the ``last`` most recent."""
+        return self.count(self.absent & self.window(last))
+
+    def listings(self, last=None):
+        """Contests each student was listed in among the ``last`` most recent."""
+        return self.count(self.listed & self.window(last))
+
+    def chronic(self, absent, last):
+        """Students absent from at least ``absent`` of the ``last`` most recent contests."""
+        return self.absences(last) >= absent
+
+    def streak(self):
+        """Contests missed since each student last took part (all of them if never)."""
+        return self.count(self.absent & self._above(self.last_participation()))
+
+    def first_participation(self):
+        """Index of each student's first contest with a rank, or -1 if they never took part."""
+        return self._lowest(self.present)
+
+    def last_participation(self):
+        return self._highest(self.present)
+
+    def _lowest(self, bits):
+        nonzero = bits != 0
+        byte = nonzero.argmax(axis=1)
+        value = bits[np.arange(len(bits)), byte]
+        return np.where(nonzero.any(axis=1), byte * 8 + LOWEST[value], -1)
+
+    def _highest(self, bits):
+        nonzero = bits != 0
+        byte = bits.shape[1] - 1 - nonzero[:, ::-1].argmax(axis=1)
+        value = bits[np.arange(len(bits)), byte]
+        return np.where(nonzero.any(axis=1), byte * 8 + HIGHEST[value], -1)
+
+    def _above(self, positions):
+        # Per row, a packed mask of the bits strictly above ``positions``.
+        start = positions + 1
+        byte = (start // 8)[:, None]
+        head = ((0xFF << (start % 8)) & 0xFF).astype(np.uint8)[:, None]
+        index = np.arange(self.listed.shape[1])[None, :]
+        return np.where(index > byte, np.uint8(0xFF), np.where(index == byte, head, np.uint8(0)))
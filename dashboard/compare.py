@@ -0,0 +1,47 @@
+"""Contest-against-contest tables for the Compare Contests page.
+
+Everything here is computed from the per-contest count cubes
+(``dashboard.cube``), which are cached once per contest version.  Comparing
+one more contest therefore costs one cube lookup and a few sums.  Deltas are
+always taken against the first (baseline) contest.
+"""
+import pandas as pd
+
+from dashboard import render
+
+
+def _with_deltas(columns, deltas=True):
+    frame = pd.DataFrame(columns).fillna(0).astype(int)
+    if deltas:
+        baseline = frame.columns[0]
+        for column in frame.columns[1:]:
+            frame[f'{column} Δ'] = frame[column] - frame[baseline]
+    return frame
+
+
+def participation(views, dim):
+    """Participants and participation % per ``dim`` label, one column pair per contest,
+    plus each later contest's change in participants against the baseline."""
+    present = _with_deltas({name: view.participants().counts_by(dim) for name, view in views.items()})
+    listed = pd.DataFrame({name: view.counts_by(dim) for name, view in views.items()}).fillna(0)
+    for name in views:
+        present[f'{name} %'] = (100 * present[name] / listed[name].where(listed[name] > 0)).round(1)
+    present = present[(present[list(views)] > 0).any(axis=1)]
+    return present.sort_values(by=list(views)[-1], ascending=False)
+
+
+def prob_counts(views):
+    """Participants per number of problems solved, per contest, with deltas."""
+    return _with_deltas({name: view.prob_counts() for name, view in views.items()})
+
+
+def rank_bins(views):
+    """Participants per rank range (the Download image's ranges), per contest, with deltas."""
+    return _with_deltas({name: view.rank_bins(render.RANK_BINS, render.RANK_BIN_LABELS)
+                         for name, view in views.items()})
+
+
+def long_form(table, names, index_name):
+    """``table``'s per-contest count columns as (label, Contest, Count) rows for grouped charts."""
+    frame = table[names].rename_axis(index_name).reset_index()
+    return frame.melt(id_vars=index_name, var_name='Contest', value_name='Count')
@@ -0,0 +1,222 @@
+"""Precomputed count cube behind the Dashboard and Download metrics.
+
+Each contest is reduced once to a dense array of student counts over
+(Year, Department, Domain, Present, ProbCount, RankBin).  Every pie, bar and
+metric on those pages is a slice of that array followed by a sum over the
+other axes, so changing a filter never touches the student rows again.
+
+Rank bins are stored at the finest granularity any page uses (``RANK_EDGES``);
+``Cube.rank_bins`` rolls them up into the coarser layouts the pages draw.
+Absent students (``Rank == 0``) sit in their own bin 0.
+
+Cubes of different contests add up (``Cube.__add__`` aligns their labels), so
+``aggregate`` serves multi-contest views by folding in one contest at a time;
+only one contest's rows are ever in memory.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import filters, ingest, registry, store
+
+DIMENSIONS = ('Year', 'Department', 'Domain', 'Present', 'ProbCount', 'RankBin')
+COLUMNS = ['Year', 'Department', 'Domain', 'Rank', 'ProbCount']
+
+# Upper edges of the rank bins; ranks beyond the last edge share one open bin.
+RANK_EDGES = [1000, 5000, 10000, 15000, 20000, 25000, 30000]
+
+MIN_PROBLEMS = 4
+
+
+_PREFERRED = {'Year': ingest.YEARS, 'Domain': ingest.DOMAINS}
+
+
+def _labels(values, preferred=()):
+    present = set(values)
+    ordered = [label for label in preferred if label in present]
+    return ordered + sorted(present.difference(ordered))
+
+
+def _merge_labels(dim, first, second):
+    if dim in ('ProbCount', 'RankBin'):
+        # Positional: label i is i.
+        return list(range(max(len(first), len(second))))
+    if dim == 'Present':
+        return first
+    return _labels(first + second, _PREFERRED.get(dim, ()))
+
+
+class Cube:
+
+    def __init__(self, labels, counts):
+        self.labels = labels
+        self.counts = counts
+
+    @classmethod
+    def from_frame(cls, frame):
+        rank = frame['Rank'].to_numpy()
+        solved = frame['ProbCount'].clip(lower=0).to_numpy()
+        labels = {
+            'Year': _labels(frame['Year'], ingest.YEARS),
+            'Department': _labels(frame['Department']),
+            'Domain': _labels(frame['Domain'], ingest.DOMAINS),
+            'Present': [False, True],
+            'ProbCount': list(range(max(MIN_PROBLEMS, int(solved.max(initial=0))) + 1)),
+            'RankBin': list(range(len(RANK_EDGES) + 2)),
+        }
+        codes = [
+            pd.Categorical(frame['Year'], categories=labels['Year']).codes,
+            pd.Categorical(frame['Department'], categories=labels['Department']).codes,
+            pd.Categorical(frame['Domain'], categories=labels['Domain']).codes,
+            (rank > 0).astype(np.intp),
+            solved,
+            np.where(rank > 0, np.searchsorted(RANK_EDGES, rank, side='left') + 1, 0),
+        ]
+        shape = tuple(len(labels[dim]) for dim in DIMENSIONS)
+        flat = np.ravel_multi_index(codes, shape)
+        counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape).astype(np.int32)
+        return cls(labels, counts)
+
+    def __add__(self, other):
+        labels = {dim: _merge_labels(dim, self.labels[dim], other.labels[dim]) for dim in DIMENSIONS}
+        return Cube(labels, self._expand(labels) + other._expand(labels))
+
+    def _expand(self, labels):
+        # These counts laid out over ``labels``, a superset of this cube's labels.
+        counts = np.zeros(tuple(len(labels[dim]) for dim in DIMENSIONS), dtype=self.counts.dtype)
+        positions = [[labels[dim].index(label) for label in self.labels[dim]] for dim in DIMENSIONS]
+        counts[np.ix_(*positions)] = self.counts
+        return counts
+
+    def options(self, field, **selection):
+        """'All' plus the values of ``field`` with students under the rest of ``selection``.
+
+        Same contract as ``FilterIndex.options``, so a cube can drive
+        ``sidebar.cascade_filters`` where there are no rows to index.
+        """
+        selection = {key: value for key, value in selection.items() if key != filters.KEYS[field]}
+        counts = self.select(**selection).counts_by(field)
+        return ['All'] + [label for label, count in counts.items() if count > 0]
+
+    def select(self, year='All', department='All', domain='All'):
+        """Slice the cube down to one Year/Department/Domain selection ('All' keeps the axis)."""
+        index = []
+        for dim, value in zip(DIMENSIONS, (year, department, domain)):
+            if value == 'All':
+                index.append(slice(None))
+            elif value in self.labels[dim]:
+                position = self.labels[dim].index(value)
+                index.append(slice(position, position + 1))
+            else:
+                index.append(slice(0, 0))
+        labels = {dim: (self.labels[dim] if value == 'All' else [value])
+                  for dim, value in zip(DIMENSIONS, (year, department, domain))}
+        counts = self.counts[tuple(index)]
+        if counts.size == 0:
+            # A value this contest lacks: zeros, keeping the axes left at 'All'.
+            shape = tuple(len(labels[dim]) for dim in DIMENSIONS[:3]) + self.counts.shape[3:]
+            counts = np.zeros(shape, dtype=self.counts.dtype)
+        return Cube({**self.labels, **labels}, counts)
+
+    def counts_by(self, dim):
+        """Roll the cube up onto one dimension, zero counts included."""
+        axis = DIMENSIONS.index(dim)
+        other = tuple(i for i in range(len(DIMENSIONS)) if i != axis)
+        return pd.Series(self.counts.sum(axis=other), index=self.labels[dim], name='Count')
+
+    def participants(self):
+        """The cube restricted to present students."""
+        return Cube({**self.labels, 'Present': [True]}, self.counts[:, :, :, 1:2])
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    @property
+    def present(self):
+        return int(self.counts[:, :, :, 1].sum())
+
+    @property
+    def absent(self):
+        return int(self.counts[:, :, :, 0].sum())
+
+    def prob_counts(self, problems=range(MIN_PROBLEMS + 1)):
+        """Present students per number of problems solved."""
+        solved = self.counts[:, :, :, 1].sum(axis=(0, 1, 2, 4))
+        return pd.Series([int(solved[p]) if p < len(solved) else 0 for p in problems],
+                         index=list(problems), name='Count')
+
+    def rank_bins(self, edges, labels):
+        """Present students per rank range.
+
+        ``edges`` are bin boundaries as for ``pd.cut`` and must be drawn from
+        ``RANK_EDGES`` (plus the leading 0); a final edge of ``None`` makes the
+        last bin open-ended, otherwise ranks past it are not counted.
+        """
+        fine = self.counts_by('RankBin').to_numpy()
+        fine_edges = [0] + RANK_EDGES + [None]
+        totals = []
+        for low, high in zip(edges[:-1], edges[1:]):
+            start = fine_edges.index(low) + 1
+            stop = fine_edges.index(high) + 1 if high is not None else len(fine)
+            totals.append(int(fine[start:stop].sum()))
+        return pd.Series(totals, index=labels, name='Count')
+
+
+@registry.per_contest('cube')
+def for_contest(contest_id, version):
+    """The (shared, read-only) cube of a contest given as ``Contest``, id or name."""
+    return Cube.from_frame(store.read(contest_id, columns=COLUMNS))
+
+
+class _AggregateCache:
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._cubes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._cubes:
+                self._cubes.move_to_end(key)
+            return self._cubes.get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            self._cubes[key] = value
+            while len(self._cubes) > self.max_entries:
+                self._cubes.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def _aggregates():
+    return _AggregateCache()
+
+
+def aggregate_key(contests):
+    """Identifies the aggregate of ``contests``; changes when any of their files does."""
+    return tuple(sorted((contest.id, registry.version(contest)) for contest in contests))
+
+
+def aggregate(contests, progress=None):
+    """The summed cube of several contests.
+
+    Contests are folded in one at a time and the result is cached per set of
+    contest versions.  ``progress(done, total)`` is called after each contest
+    while a cube is being built, never on a cache hit.
+    """
+    key = aggregate_key(contests)
+    total = _aggregates().get(key)
+    if total is not None:
+        return total
+    for done, (contest_id, version) in enumerate(key, start=1):
+        part = for_contest.build(contest_id, version)
+        total = part if total is None else total + part
+        if progress is not None:
+            progress(done, len(key))
+    _aggregates().put(key, total)
+    return total
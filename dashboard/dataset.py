@@ -0,0 +1,97 @@
+"""Compact, process-wide contest datasets shared by every browser session.
+
+Each contest is held once per server process in the smallest faithful dtypes:
+categories for the low-cardinality text columns and small integers for the
+numbers.  The personal columns (``Mail ID``, ``Mobile Number``) are only read
+from the store the first time a page asks for them.
+
+``ContestDataset.frame`` hands out a shallow view.  With pandas' copy-on-write
+semantics a page can filter or even assign into that view without copying
+the shared arrays up front and without affecting any other session.
+
+Run ``python -m dashboard.dataset`` for a bytes-per-row report to size servers.
+"""
+import functools
+import threading
+
+import pandas as pd
+
+from dashboard import registry, store
+
+CORE_COLUMNS = ['Name', 'Reg Number', 'Username', 'Year', 'Department', 'Section', 'Domain',
+                'Rank', 'Score', 'ProbCount']
+PII_COLUMNS = ['Mail ID', 'Mobile Number']
+
+DTYPES = {
+    'Year': 'category',
+    'Department': 'category',
+    'Section': 'category',
+    'Domain': 'category',
+    'Rank': 'int32',
+    'Score': 'int16',
+    'ProbCount': 'int8',
+}
+
+
+class ContestDataset:
+
+    def __init__(self, contest_id, version):
+        self.contest_id = contest_id
+        self.version = version
+        self._core = store.read(contest_id, columns=CORE_COLUMNS).astype(DTYPES)
+        self._pii = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._core)
+
+    @property
+    def frame(self):
+        """A copy-on-write view of the core columns."""
+        return self._core.copy(deep=False)
+
+    def pii(self):
+        """A copy-on-write view of the personal columns, loaded on first use."""
+        with self._lock:
+            if self._pii is None:
+                self._pii = store.read(self.contest_id, columns=PII_COLUMNS)
+        return self._pii.copy(deep=False)
+
+    def rows(self, rows, columns=None, with_pii=False):
+        """Materialize only the given row ids (and columns) of the contest."""
+        frame = self._core.iloc[rows]
+        if with_pii:
+            frame = frame.join(self.pii().iloc[rows])
+        return frame if columns is None else frame[columns]
+
+    @functools.cached_property
+    def nbytes(self):
+        """Resident bytes of the core columns, measured once: they never change."""
+        return int(self._core.memory_usage(deep=True).sum())
+
+    def memory_usage(self):
+        """Resident bytes of the core columns and, if loaded, the personal ones."""
+        pii = int(self._pii.memory_usage(deep=True).sum()) if self._pii is not None else 0
+        return self.nbytes, pii
+
+
+@registry.per_contest('dataset')
+def for_contest(contest_id, version):
+    """The shared dataset of a contest given as ``Contest``, id or display name."""
+    return ContestDataset(contest_id, version)
+
+
+def main():
+    # "read_csv" is what every session used to hold: the raw file in default dtypes.
+    print(f'{"contest":>8} {"rows":>7} {"core B/row":>11} {"pii B/row":>10} {"read_csv B/row":>15}')
+    for contest in registry.discover():
+        data = for_contest(contest)
+        data.pii()
+        core, pii = data.memory_usage()
+        naive = pd.read_csv(contest.path).memory_usage(deep=True).sum()
+        print(f'{contest.id:>8} {len(data):>7} {core / len(data):>11.0f} {pii / len(data):>10.0f} '
+              f'{naive / len(data):>15.0f}')
+
+
+if __name__ == '__main__':
+    main()
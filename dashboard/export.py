@@ -0,0 +1,105 @@
+"""Batch export of the downloadable dashboard image for every contest x department x year.
+
+    python -m dashboard.export --out exports/ [--contest w412 ...] [--format png] [--dpi 500]
+
+This draws the same image as the Download page (``render.selection_data`` and
+``render.render_image``) for every Department/Year pair that has students,
+'All' included, into ``<out>/<contest>/<department>_<year>@<dpi>.png`` (no
+``@<dpi>`` for the vector formats).  Images are rendered in a process pool
+sized to the CPU count; an image newer than its contest's stored data is
+left alone unless ``--force`` is given.
+"""
+import argparse
+import functools
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dashboard import cube, dataset, filters, registry, render, topk
+
+
+def _slug(value):
+    return re.sub(r'[^\w.-]+', '-', value).strip('-')
+
+
+def output_path(out_dir, contest, department, year, fmt, dpi=render.FULL_DPI):
+    # The DPI is part of a PNG's name, so a run at another DPI never counts it as up to date.
+    resolution = f'@{dpi}' if fmt == 'png' else ''
+    return os.path.join(out_dir, contest.id, f'{_slug(department)}_{_slug(year)}{resolution}.{fmt}')
+
+
+@functools.lru_cache(maxsize=None)
+def _contest(contest_id, version):
+    # Loaded once by the planning process; forked workers inherit the loaded contests.
+    data = dataset.ContestDataset(contest_id, version)
+    frame = data.frame
+    return frame, filters.FilterIndex(frame), cube.Cube.from_frame(frame), topk.TopK(frame)
+
+
+def _render(job):
+    contest_id, version, contest_name, department, year, path, fmt, dpi = job
+    start = time.perf_counter()
+    data = render.selection_data(contest_name, *_contest(contest_id, version),
+                                 year=year, department=department)
+    image = render.render_image(data, fmt, dpi)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f'{path}.{os.getpid()}.tmp'
+    with open(partial, 'wb') as file:
+        file.write(image)
+    os.replace(partial, path)
+    return path, time.perf_counter() - start, len(image)
+
+
+def plan(contests, out_dir, fmt='png', dpi=render.FULL_DPI, force=False):
+    """Jobs still to render and the number of up-to-date outputs skipped."""
+    jobs, skipped = [], 0
+    for contest in contests:
+        version = registry.version(contest)
+        index = _contest(contest.id, version)[1]
+        for department in index.options('Department'):
+            for year in index.options('Year'):
+                if not index.count(year=year, department=department):
+                    continue
+                path = output_path(out_dir, contest, department, year, fmt, dpi)
+                if not force and os.path.exists(path) and os.stat(path).st_mtime_ns >= version:
+                    skipped += 1
+                    continue
+                jobs.append((contest.id, version, contest.name, department, year, path, fmt, dpi))
+    return jobs, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', required=True, help='output directory')
+    parser.add_argument('--contest', action='append', help='contest id (repeatable); default: all')
+    parser.add_argument('--format', choices=list(render.FORMATS), default='png')
+    parser.add_argument('--dpi', type=int, default=render.FULL_DPI)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--force', action='store_true', help='re-render up-to-date images')
+    args = parser.parse_args()
+
+    if args.contest:
+        try:
+            contests = [registry.get(contest_id) for contest_id in args.contest]
+        except KeyError as error:
+            parser.error(error.args[0])
+    else:
+        contests = registry.discover()
+
+    start = time.perf_counter()
+    jobs, skipped = plan(contests, args.out, args.format, args.dpi, args.force)
+    print(f'{len(jobs)} to render, {skipped} up to date, {args.workers} workers')
+    total_bytes = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for future in as_completed([pool.submit(_render, job) for job in jobs]):
+            path, seconds, size = future.result()
+            total_bytes += size
+            print(f'{seconds:>7.2f}s {size / 1024:>8.0f} KiB  {path}')
+    elapsed = time.perf_counter() - start
+    print(f'rendered {len(jobs)} images ({total_bytes / 2**20:.1f} MiB) in {elapsed:.1f}s, '
+          f'{len(jobs) / elapsed:.2f} images/s')
+
+
+if __name__ == '__main__':
+    main()
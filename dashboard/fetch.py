@@ -0,0 +1,281 @@
+"""Fetch a contest's ranking and write it out as a contest file.
+
+    python -m dashboard.fetch --roster roster.csv --contest w413 [--out .]
+                              [--base-url https://leetcode.com] [--concurrency 8]
+
+The ranking is read page by page from LeetCode's public contest ranking API
+(``/contest/api/ranking/<slug>/?pagination=<page>&region=global``, 25
+participants a page).  Pages are fetched by asyncio tasks bounded by a
+semaphore over a pool of keep-alive connections; failed requests (connection
+errors, timeouts, 429 and 5xx) are retried with exponential backoff and
+jitter, honouring ``Retry-After``.
+
+Every finished page is appended to a JSONL checkpoint next to the output, so
+an interrupted fetch resumes where it stopped.  Once every page is in, each
+roster row gets the ``Rank``/``Score``/``ProbCount`` of its ``Username`` (0 if
+the student did not take part) and the result is written as
+``<out>/<contest>.csv`` in the canonical schema of ``dashboard.ingest``.
+
+Only the standard library is used for HTTP.  ``benchmarks/ranking_stub.py``
+serves recorded or synthetic ranking pages for offline runs.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import ssl
+import time
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from dashboard import ingest
+
+PAGE_SIZE = 25
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_KIND_SLUGS = {'w': 'weekly-contest', 'bw': 'biweekly-contest'}
+
+
+class FetchError(Exception):
+    pass
+
+
+def slug(contest_id):
+    """'w412' -> 'weekly-contest-412', 'bw136' -> 'biweekly-contest-136'."""
+    match = re.fullmatch(r'(bw|w)(\d+)', contest_id)
+    if not match:
+        raise ValueError(f'Not a contest id: {contest_id!r}')
+    return f'{_KIND_SLUGS[match.group(1)]}-{match.group(2)}'
+
+
+def ranking_path(contest_id, page):
+    return f'/contest/api/ranking/{slug(contest_id)}/?pagination={page}&region=global'
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one host, reused across requests."""
+
+    def __init__(self, base_url, size, timeout=30):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.tls = url.scheme == 'https'
+        self.port = url.port or (443 if self.tls else 80)
+        self.size = size
+        self.timeout = timeout
+        self.opened = 0
+        self._idle = []
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port,
+                                             ssl=ssl.create_default_context() if self.tls else None)
+
+    async def get(self, path):
+        """``(status, headers, body)`` of a GET request."""
+        reader, writer = self._idle.pop() if self._idle else await self._open()
+        try:
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\nAccept: application/json\r\n'
+                         f'User-Agent: contest-dashboard-fetch\r\n\r\n'.encode())
+            await writer.drain()
+            status, headers, body = await asyncio.wait_for(_read_response(reader), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get('connection', '').lower() == 'close' or len(self._idle) >= self.size:
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return status, headers, body
+
+    def close(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = bytearray()
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            chunk = await reader.readexactly(size + 2)
+            if not size:
+                break
+            body += chunk[:-2]
+        return status, headers, bytes(body)
+    return status, headers, await reader.readexactly(int(headers.get('content-length', 0)))
+
+
+class Checkpoint:
+    """Append-only JSONL record of the pages fetched so far."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        self.page_count = None
+        # Bytes up to the end of the last complete record.
+        good = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if not line.endswith(b'\n'):
+                        break
+                    good += len(line)
+                    if 'page_count' in record:
+                        self.page_count = record['page_count']
+                    else:
+                        self.pages[record['page']] = record['rows']
+        self._file = open(path, 'a', encoding='utf-8')
+        # Cut off a torn last line from an interrupted run, or the next record
+        # would be appended to it and lost along with it.
+        self._file.truncate(good)
+
+    def _append(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def set_page_count(self, page_count):
+        if self.page_count != page_count:
+            self.page_count = page_count
+            self._append({'page_count': page_count})
+
+    def add(self, page, rows):
+        self.pages[page] = rows
+        self._append({'page': page, 'rows': rows})
+
+    def close(self):
+        self._file.close()
+
+
+def parse_page(payload):
+    """``[username, rank, score, problems solved]`` per participant on a ranking page."""
+    submissions = payload.get('submissions') or [{}] * len(payload['total_rank'])
+    return [[entry['username'], int(entry['rank']), int(entry['score']), len(solved)]
+            for entry, solved in zip(payload['total_rank'], submissions)]
+
+
+class Fetcher:
+
+    def __init__(self, base_url, concurrency=8, retries=5, backoff=0.5, timeout=30):
+        self.pool = ConnectionPool(base_url, concurrency, timeout)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.requests = 0
+        self.retried = 0
+
+    async def page(self, contest_id, page):
+        """The decoded JSON of one ranking page, retrying transient failures."""
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt * (0.5 + random.random())
+            async with self.semaphore:
+                self.requests += 1
+                try:
+                    status, headers, body = await self.pool.get(ranking_path(contest_id, page))
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+                    failure = f'{type(error).__name__}: {error}'
+                else:
+                    if status == 200:
+                        return json.loads(body)
+                    if status not in RETRY_STATUSES:
+                        raise FetchError(f'page {page}: HTTP {status}')
+                    failure = f'HTTP {status}'
+                    if headers.get('retry-after', '').isdigit():
+                        delay = max(delay, int(headers['retry-after']))
+            if attempt == self.retries:
+                raise FetchError(f'page {page}: {failure} after {self.retries} retries')
+            self.retried += 1
+            await asyncio.sleep(delay)
+
+    async def ranking(self, contest_id, checkpoint, progress=None):
+        """Every participant of the contest, fetching only pages missing from ``checkpoint``."""
+        if checkpoint.page_count is None:
+            first = await self.page(contest_id, 1)
+            checkpoint.set_page_count(max(1, math.ceil(int(first['user_num']) / PAGE_SIZE)))
+            checkpoint.add(1, parse_page(first))
+        missing = [page for page in range(1, checkpoint.page_count + 1) if page not in checkpoint.pages]
+
+        async def fetch(page):
+            checkpoint.add(page, parse_page(await self.page(contest_id, page)))
+            if progress is not None:
+                progress(len(checkpoint.pages), checkpoint.page_count)
+
+        try:
+            await asyncio.gather(*(fetch(page) for page in missing))
+        finally:
+            self.pool.close()
+        return [row for page in sorted(checkpoint.pages) for row in checkpoint.pages[page]]
+
+
+def merge(roster, ranking):
+    """``roster`` in the canonical schema, with each Username's rank, score and problem count."""
+    results = {username.lower(): (rank, score, solved) for username, rank, score, solved in ranking}
+    frame = roster.copy()
+    for column in ingest.COLUMNS:
+        if column not in frame:
+            frame[column] = pd.NA
+    found = [results.get(str(username).lower(), (0, 0, 0)) for username in frame['Username']]
+    frame[ingest.NUMERIC_COLUMNS] = pd.DataFrame(found, columns=['Rank', 'Score', 'ProbCount'], index=frame.index)
+    return frame[ingest.COLUMNS]
+
+
+def fetch(roster_path, contest_id, out_dir, base_url='https://leetcode.com', concurrency=8, progress=None):
+    """Fetch ``contest_id``'s ranking for a roster CSV and write ``<out_dir>/<contest_id>.csv``.
+
+    Returns the output path and the ``Fetcher`` (for its request counts).
+    """
+    roster = ingest.read_raw(roster_path)
+    if 'Username' not in roster:
+        raise ValueError(f'{roster_path} has no Username column')
+    checkpoint = Checkpoint(os.path.join(out_dir, f'.{contest_id}.fetch.jsonl'))
+    fetcher = Fetcher(base_url, concurrency)
+    try:
+        ranking = asyncio.run(fetcher.ranking(contest_id, checkpoint, progress))
+    finally:
+        checkpoint.close()
+    target = os.path.join(out_dir, f'{contest_id}.csv')
+    partial = f'{target}.{os.getpid()}.tmp'
+    merge(roster, ranking).to_csv(partial, index=False)
+    os.replace(partial, target)
+    os.remove(checkpoint.path)
+    return target, fetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--roster', required=True, help='CSV with at least a Username column')
+    parser.add_argument('--contest', required=True, help="contest id, e.g. 'w413' or 'bw137'")
+    parser.add_argument('--out', default='.', help='directory for the contest file (default: here)')
+    parser.add_argument('--base-url', default='https://leetcode.com')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f'{done}/{total} pages', flush=True)
+
+    target, fetcher = fetch(args.roster, args.contest, args.out, args.base_url, args.concurrency, progress)
+    elapsed = time.perf_counter() - start
+    print(f'wrote {target}: {fetcher.requests} requests ({fetcher.retried} retried) over '
+          f'{fetcher.pool.opened} connections in {elapsed:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
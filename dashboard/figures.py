@@ -0,0 +1,198 @@
+"""Plotly figures for the Dashboard page and the cache they are served from.
+
+Figures are cached process-wide as serialized JSON specs, keyed by contest,
+contest version, the Year/Department/Domain selection and a chart id.  A hit
+skips both the data work and Plotly Express' layout work; the cache is
+bounded by total spec size and entries expire after a TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+import streamlit as st
+
+from dashboard import perf
+
+# The Dashboard's rank range chart.
+RANK_BINS = [0, 5000, 10000, 15000, 20000, 25000, 30000]
+RANK_BIN_LABELS = ['0-5000', '5000-10000', '10000-15000', '15000-20000', '20000-25000', '25000-30000']
+
+
+class FigureCache:
+
+    def __init__(self, max_bytes=64 * 2**20, ttl=3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._specs = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the figure cached under ``key``, calling ``build()`` on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._specs.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                perf.count('figures', True)
+                return pio.from_json(entry[1])
+            self.misses += 1
+        perf.count('figures', False)
+        figure = build()
+        self._put(key, now, figure.to_json())
+        return figure
+
+    def _put(self, key, created, spec):
+        with self._lock:
+            previous = self._specs.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._specs[key] = (created, spec)
+            self._size += len(spec)
+            while self._size > self.max_bytes and len(self._specs) > 1:
+                _, (_, evicted) = self._specs.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._specs), 'bytes': self._size}
+
+
+@st.cache_resource(show_spinner=False)
+def cache():
+    """The process-wide figure cache."""
+    return FigureCache()
+
+
+def ordinal(n):
+    """1 -> '1st', 2 -> '2nd', 11 -> '11th', 23 -> '23rd'."""
+    if 10 < n % 100 < 20 or n % 10 == 0 or n % 10 >= 4:
+        return f'{n}th'
+    return f"{n}{['st', 'nd', 'rd'][n % 10 - 1]}"
+
+
+def domain_pie(domain_counts):
+    fig = px.pie(values=domain_counts, names=domain_counts.index)
+    fig.update_traces(marker=dict(colors=px.colors.sequential.Cividis))
+    fig.update_layout(legend=dict(title='Domain', orientation='h', x=1, y=0.7))
+    return fig
+
+
+def presence_pie(present, absent):
+    presence_data = pd.DataFrame({'Presence': ['Present', 'Absent'], 'Count': [present, absent]})
+    fig = px.pie(presence_data, values='Count', names='Presence', color='Presence',
+                 color_discrete_map={'Present': 'green', 'Absent': 'red'})
+    fig.update_layout(legend=dict(title='Presence', orientation='h', x=0.8, y=0.7))
+    return fig
+
+
+def top_performers_bar(top, n=10):
+    """Horizontal bars of ``top``, the best participants ordered best first."""
+    # Best rank at the top of a horizontal bar chart means plotting it last.
+    top = top[::-1]
+    names_with_ranks = [f"{name} ({ordinal(len(top) - i)} Rank)" for i, name in enumerate(top['Name'])]
+    fig = px.bar(top, y=names_with_ranks, x='Rank',
+                 hover_data=['Year', 'Domain', 'Department', 'Score', 'ProbCount'],
+                 labels={'Rank': 'Ranking'},
+                 color='Rank',
+                 color_continuous_scale='viridis',
+                 title=f'Top {n} Performers (Intra College Ranking)',
+                 orientation='h')
+    fig.update_layout(xaxis_title='Ranking Score', yaxis_title='Name')
+    return fig
+
+
+def department_pie(department_counts):
+    fig = px.pie(values=department_counts, names=department_counts.index)
+    fig.update_traces(marker=dict(colors=px.colors.sequential.Viridis))
+    fig.update_layout(legend=dict(title='Department', orientation='h', x=1, y=0.7))
+    return fig
+
+
+def problems_bar(problem_data):
+    fig = px.bar(problem_data, x='Problems', y='Count')
+    fig.update_traces(marker_color='skyblue')
+    return fig
+
+
+def rank_bar(rank_data):
+    fig = px.bar(rank_data, x='Rank Range', y='Count')
+    fig.update_traces(marker_color='purple')
+    return fig
+
+
+def domain_counts(view):
+    """Students per domain of a cube slice, largest first, empty domains left out."""
+    counts = view.counts_by('Domain')
+    return counts[counts > 0].sort_values(ascending=False)
+
+
+def problem_data(view):
+    counts = view.prob_counts()
+    return pd.DataFrame({'Problems': counts.index, 'Count': counts.values})
+
+
+def rank_data(view):
+    counts = view.rank_bins(RANK_BINS, RANK_BIN_LABELS)
+    return pd.DataFrame({'Rank Range': counts.index, 'Count': counts.values})
+
+
+def dashboard(scope_key, selection, contest_cube, view, top=None):
+    """The Dashboard's figures for one selection by chart id, served from ``cache()``.
+
+    ``scope_key`` identifies the contest (or contests) behind ``contest_cube``
+    and ``view`` is that cube sliced to ``selection``.  ``top()`` returns the
+    best performers' rows, best first, and is only called on a miss; without
+    it (ranks do not add up across contests) there is no ``top_performers``.
+    """
+    figure_key = scope_key + (selection['year'], selection['department'], selection['domain'])
+    charts = {
+        'domain': (figure_key, lambda: domain_pie(domain_counts(view))),
+        'presence': (figure_key, lambda: presence_pie(view.present, view.absent)),
+        # The department split is contest-wide, so one entry serves every filter.
+        'department': (scope_key, lambda: department_pie(
+            contest_cube.counts_by('Department').sort_values(ascending=False))),
+        'problems': (figure_key, lambda: problems_bar(problem_data(view))),
+        'rank_range': (figure_key, lambda: rank_bar(rank_data(view))),
+    }
+    if top is not None:
+        charts['top_performers'] = (figure_key, lambda: top_performers_bar(top()))
+    figure_cache = cache()
+    return {chart: figure_cache.get(key + (chart,), build) for chart, (key, build) in charts.items()}
+
+
+def rank_trend(trajectory):
+    """A student's rank per contest attended; better ranks plot higher."""
+    attended = trajectory[trajectory['Present']]
+    fig = px.line(attended, x='Date', y='Rank', markers=True, hover_data=['Contest', 'Score', 'ProbCount'],
+                  title='Rank per Contest')
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
+
+def participation_bar(cohort):
+    fig = px.bar(cohort, x='Date', y='Participation %', hover_data=['Contest', 'Listed', 'Present'],
+                 title='Participation')
+    fig.update_traces(marker_color='green')
+    return fig
+
+
+def median_rank_line(cohort):
+    fig = px.line(cohort, x='Date', y='Median Rank', markers=True,
+                  hover_data=['Contest', 'Mean Score', 'Mean ProbCount'], title='Median Rank of Participants')
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
+
+def grouped_bar(frame, x, title):
+    """Side-by-side bars of ``frame``'s ``Count`` per ``x``, one colour per ``Contest``."""
+    fig = px.bar(frame, x=x, y='Count', color='Contest', barmode='group', title=title)
+    fig.update_layout(legend=dict(orientation='h', y=-0.2))
+    return fig
@@ -0,0 +1,61 @@
+"""Bitmap index behind the cascading Year -> Department -> Domain selectors.
+
+For every value of every filter field the index keeps a packed bitmap of the
+rows holding it.  "Which departments are still valid for year II?" and "which
+rows match II / CSE / SDE?" are then answered by AND-ing a handful of bitmaps
+instead of building boolean masks over the frame on every rerun.
+
+Row ids are positions in the contest's stored order, i.e. they line up with
+the frames handed out by ``dashboard.dataset`` for the same contest.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard import registry, store
+
+FIELDS = ('Year', 'Department', 'Domain')
+
+# Keyword used for each field by the pages and their session state.
+KEYS = {'Year': 'year', 'Department': 'department', 'Domain': 'domain'}
+
+
+class FilterIndex:
+
+    def __init__(self, frame):
+        self.size = len(frame)
+        self.values = {}
+        self.bitmaps = {}
+        for field in FIELDS:
+            codes, uniques = pd.factorize(frame[field])
+            self.values[field] = list(uniques)
+            self.bitmaps[field] = {value: np.packbits(codes == code)
+                                   for code, value in enumerate(uniques)}
+        self._everyone = np.packbits(np.ones(self.size, dtype=bool))
+
+    def mask(self, year='All', department='All', domain='All', exclude=None):
+        """Packed bitmap of the rows matching a selection; 'All' does not filter."""
+        mask = self._everyone
+        for field, value in zip(FIELDS, (year, department, domain)):
+            if value == 'All' or field == exclude:
+                continue
+            mask = mask & self.bitmaps[field].get(value, 0)
+        return mask
+
+    def options(self, field, **selection):
+        """'All' plus the values of ``field`` that still have rows under ``selection``."""
+        mask = self.mask(exclude=field, **selection)
+        return ['All'] + [value for value in self.values[field]
+                          if np.bitwise_and(self.bitmaps[field][value], mask).any()]
+
+    def rows(self, **selection):
+        """Sorted row ids matching ``selection``."""
+        return np.flatnonzero(np.unpackbits(self.mask(**selection), count=self.size))
+
+    def count(self, **selection):
+        return int(np.unpackbits(self.mask(**selection), count=self.size).sum())
+
+
+@registry.per_contest('filters')
+def for_contest(contest_id, version):
+    """The (shared, read-only) filter index of a contest given as ``Contest``, id or name."""
+    return FilterIndex(store.read(contest_id, columns=list(FIELDS)))
@@ -0,0 +1,235 @@
+"""Per-student history across every contest.
+
+Contests are joined on a student identity that survives the exports' quirks:
+a row belongs to the student already known under its Reg Number or its
+(lower-cased) Username, so a student whose Reg Number was mangled in one
+export is still matched by Username and vice versa.
+
+``History`` keeps one column of (student, Rank, Score, ProbCount) per contest
+and assembles students x contests matrices from them on demand.  ``sync``
+appends contests as new files appear; only a changed or back-dated file
+causes a rebuild.  Latest Name/Year/Department/Domain come from the most
+recent contest a student is listed in.
+"""
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from dashboard import attendance, filters, registry, search, store
+
+COLUMNS = ['Name', 'Reg Number', 'Username', 'Year', 'Department', 'Domain', 'Rank', 'Score', 'ProbCount']
+STUDENT_COLUMNS = ['Name', 'Username', 'Reg Number', 'Year', 'Department', 'Domain']
+MEASURES = {'Rank': np.int32, 'Score': np.int16, 'ProbCount': np.int8}
+
+
+# An alias table: keys and the student id of each.
+_ALIASES = (pa.array([], pa.large_string()), np.empty(0, dtype=np.int64))
+
+
+def _lookup(keys, aliases, students):
+    """Student id per key, -1 where unknown or null."""
+    position = pc.index_in(keys, value_set=aliases).fill_null(-1).to_numpy()
+    found = np.full(len(keys), -1, dtype=np.int64)
+    found[position >= 0] = students[position[position >= 0]]
+    return found
+
+
+def _extend(table, keys, students):
+    aliases, ids = table
+    return pa.concat_arrays([aliases, keys.cast(pa.large_string())]), np.concatenate([ids, students])
+
+
+class History:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.contests = []
+        self._keys = []
+        self._columns = []
+        # Student ids by Reg Number and by lower-cased Username.
+        self._regs = _ALIASES
+        self._users = _ALIASES
+        self._students = {column: np.empty(0, dtype=object) for column in STUDENT_COLUMNS}
+        self._snapshot = None
+
+    def sync(self, contests):
+        """Bring the history up to date with ``contests`` (any order); returns a ``Snapshot``."""
+        contests = sorted(contests, key=lambda contest: contest.date)
+        keys = [(contest.id, registry.version(contest)) for contest in contests]
+        with self._lock:
+            if keys[:len(self._keys)] != self._keys:
+                self._reset()
+            for contest, key in zip(contests[len(self._keys):], keys[len(self._keys):]):
+                self._add(contest, key)
+                self._snapshot = None
+            if self._snapshot is None:
+                self._snapshot = Snapshot(self._keys, self.contests, self._columns, self._students)
+            return self._snapshot
+
+    def _resolve(self, frame):
+        """Student id per row of ``frame``, registering new students and aliases.
+
+        A row is the student known under its Reg Number, else under its
+        Username, else the student of the contest's first row with that
+        Username, else a new one: what matching the rows one by one gives,
+        as ingest leaves Reg Numbers unique within a contest.
+        """
+        reg = pa.array(frame['Reg Number'])
+        user = pc.utf8_lower(pa.array(frame['Username']))
+        by_reg = _lookup(reg, *self._regs)
+        by_user = _lookup(user, *self._users)
+        known = np.where(by_reg >= 0, by_reg, by_user)
+
+        # The first row of each Username (codes follow the order of first appearance).
+        codes = pc.dictionary_encode(user).indices.fill_null(-1).to_numpy()
+        seen, firsts = np.unique(codes, return_index=True)
+        heads = firsts[seen >= 0]
+        rows = np.arange(len(frame))
+        head = rows.copy()
+        head[codes >= 0] = heads[codes[codes >= 0]]
+
+        unknown = known < 0
+        new = unknown & (head == rows)
+        students = known.copy()
+        students[new] = len(self._students['Name']) + np.arange(new.sum())
+        students[unknown & ~new] = students[head[unknown & ~new]]
+
+        # New aliases map to the first student seen under them.
+        new_reg = (by_reg < 0) & reg.is_valid().to_numpy(zero_copy_only=False)
+        new_user = heads[by_user[heads] < 0]
+        self._regs = _extend(self._regs, reg.filter(new_reg), students[new_reg])
+        self._users = _extend(self._users, user.take(new_user), students[new_user])
+
+        # Contests are added oldest first, so the latest listing wins.
+        for column in STUDENT_COLUMNS:
+            values = np.concatenate([self._students[column], np.full(new.sum(), None, dtype=object)])
+            listed = frame[column].notna().to_numpy()
+            latest = pd.Series(frame[column].to_numpy(dtype=object)[listed], index=students[listed])
+            latest = latest[~latest.index.duplicated(keep='last')]
+            values[latest.index.to_numpy()] = latest.to_numpy()
+            self._students[column] = values
+        return students
+
+    def _add(self, contest, key):
+        frame = store.read(contest.id, columns=COLUMNS)
+        students = self._resolve(frame)
+        # Two rows can resolve to one student; keep the first, as ingest does.
+        students, first = np.unique(students, return_index=True)
+        column = {'student': students}
+        for measure, dtype in MEASURES.items():
+            column[measure] = frame[measure].to_numpy(dtype)[first]
+        self.contests.append(contest)
+        self._keys.append(key)
+        self._columns.append(column)
+
+
+class Snapshot:
+    """An immutable students x contests view of a ``History`` at one point in time."""
+
+    def __init__(self, keys, contests, columns, students):
+        # (contest id, version) per contest: identifies the snapshot's contents.
+        self.key = tuple(keys)
+        self.contests = list(contests)
+        self.students = pd.DataFrame({column: pd.array(values, dtype='string')
+                                      for column, values in students.items()})
+        shape = (len(self.students), len(self.contests))
+        self.listed = np.zeros(shape, dtype=bool)
+        self.matrices = {measure: np.zeros(shape, dtype=dtype) for measure, dtype in MEASURES.items()}
+        for j, column in enumerate(columns):
+            self.listed[column['student'], j] = True
+            for measure in MEASURES:
+                self.matrices[measure][column['student'], j] = column[measure]
+        self.present = self.matrices['Rank'] > 0
+        self._filter_index = None
+        self._search_index = None
+        self._attendance = None
+
+    def filter_index(self):
+        """``FilterIndex`` over the students' latest Year/Department/Domain."""
+        if self._filter_index is None:
+            self._filter_index = filters.FilterIndex(self.students.fillna('Unknown'))
+        return self._filter_index
+
+    def search_index(self):
+        if self._search_index is None:
+            self._search_index = search.SearchIndex(self.students)
+        return self._search_index
+
+    def attendance(self):
+        """``Attendance`` bitsets over the students x contests presence."""
+        if self._attendance is None:
+            self._attendance = attendance.Attendance(self.listed, self.present)
+        return self._attendance
+
+    def _columns(self, last):
+        return slice(max(len(self.contests) - last, 0), None) if last else slice(None)
+
+    def trajectory(self, student, last=None):
+        """One student's Rank/Score/ProbCount per contest they were listed in, oldest first."""
+        columns = self._columns(last)
+        contests = self.contests[columns]
+        frame = pd.DataFrame({
+            'Contest': [contest.name for contest in contests],
+            'Date': [contest.date for contest in contests],
+            **{measure: matrix[student, columns] for measure, matrix in self.matrices.items()},
+        })
+        frame['Present'] = frame['Rank'] > 0
+        return frame[self.listed[student, columns]].reset_index(drop=True)
+
+    def cohort(self, rows=None, last=None):
+        """Participation and performance of a group of students per contest, oldest first."""
+        columns = self._columns(last)
+        rows = slice(None) if rows is None else rows
+        listed = self.listed[rows, columns]
+        present = self.present[rows, columns]
+        rank = np.where(present, self.matrices['Rank'][rows, columns], np.nan)
+        with warnings.catch_warnings():
+            # Contests nobody in the group attended have no median.
+            warnings.simplefilter('ignore', RuntimeWarning)
+            frame = pd.DataFrame({
+                'Contest': [contest.name for contest in self.contests[columns]],
+                'Date': [contest.date for contest in self.contests[columns]],
+                'Listed': listed.sum(axis=0),
+                'Present': present.sum(axis=0),
+                'Median Rank': np.nanmedian(rank, axis=0),
+                'Mean Score': _mean(self.matrices['Score'][rows, columns], present),
+                'Mean ProbCount': _mean(self.matrices['ProbCount'][rows, columns], present),
+            })
+        frame['Participation %'] = (100 * frame['Present'] / frame['Listed'].where(frame['Listed'] > 0)).round(1)
+        return frame
+
+    def rank_change(self, before, after, rows=None):
+        """Students among ``rows`` ranked in both contests ``before`` and ``after``
+        (positions in ``contests``), with both ranks and the places gained."""
+        rows = np.arange(len(self.students)) if rows is None else np.asarray(rows)
+        rows = rows[self.present[rows, before] & self.present[rows, after]]
+        rank = self.matrices['Rank']
+        frame = self.students.iloc[rows][['Name', 'Username', 'Year', 'Department', 'Domain']]
+        return frame.assign(**{
+            'Rank Before': rank[rows, before],
+            'Rank After': rank[rows, after],
+            'Gain': rank[rows, before].astype(np.int64) - rank[rows, after],
+        })
+
+
+def _mean(values, mask):
+    count = mask.sum(axis=0)
+    return np.where(count > 0, (values * mask).sum(axis=0) / np.maximum(count, 1), np.nan)
+
+
+@st.cache_resource(show_spinner=False)
+def _history():
+    return History()
+
+
+def current():
+    """Snapshot of the shared history, synced with the contests on disk."""
+    return _history().sync(registry.discover())
@@ -0,0 +1,190 @@
+"""Schema-normalizing ingest stage for the contest CSVs.
+
+The exported files do not share one layout: some carry a BOM and a leading
+unnamed index column, ``w412.csv`` orders its columns differently and has no
+``Mail ID``, years are written ``II year`` or ``II`` and the same domain shows
+up as ``FullStack``, ``Fullstack``, ``full stak`` or ``Full Stack
+Development``.  ``normalize`` maps any of them onto one canonical, typed
+schema and ``ensure`` persists the result in the columnar store
+(``dashboard.store``) so the pages only ever read cleaned frames.
+
+Run ``python -m dashboard.ingest`` to (re)build every contest up front.
+"""
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import registry, store
+
+COLUMNS = ['Name', 'Reg Number', 'Username', 'Year', 'Department', 'Section', 'Domain',
+           'Mail ID', 'Mobile Number', 'Rank', 'Score', 'ProbCount']
+REQUIRED_COLUMNS = ['Name', 'Reg Number', 'Username', 'Year', 'Department', 'Domain',
+                    'Rank', 'Score', 'ProbCount']
+NUMERIC_COLUMNS = ['Rank', 'Score', 'ProbCount']
+
+YEARS = ['I', 'II', 'III', 'IV']
+DOMAINS = ['SDE', 'Full Stack', 'Data Analytics', 'Cybersecurity', 'Cloud', 'IoT',
+           'Machine Learning', 'VLSI', 'App Development', 'Other']
+UNKNOWN = 'Unknown'
+
+_YEAR_ALIASES = {'1': 'I', '2': 'II', '3': 'III', '4': 'IV'}
+
+# Keys are lower-cased with everything but letters stripped.
+_DOMAIN_ALIASES = {
+    'sde': 'SDE',
+    'fullstack': 'Full Stack',
+    'fullstak': 'Full Stack',
+    'fullstackdevelopment': 'Full Stack',
+    'dataanalytics': 'Data Analytics',
+    'dataanalyticsanddatascience': 'Data Analytics',
+    'cybersecurity': 'Cybersecurity',
+    'cloud': 'Cloud',
+    'iot': 'IoT',
+    'machinelearning': 'Machine Learning',
+    'vlsi': 'VLSI',
+    'appdevelopment': 'App Development',
+}
+
+_DEPARTMENT_ALIASES = {'Cyber Security': 'CSE (CS)'}
+
+_PLACEHOLDERS = {'', 'nan', 'left empty so replaced'}
+
+# Spreadsheet round-trips turn long digit strings into e.g. "2.10E+11", which
+# no longer identifies anybody.
+_MANGLED_NUMBER = re.compile(r'^\d+(\.\d+)?E\+\d+$', re.I)
+
+
+def _text(series):
+    series = series.astype('string').str.strip()
+    return series.mask(series.str.lower().isin(_PLACEHOLDERS))
+
+
+def _year(value):
+    if pd.isna(value):
+        return UNKNOWN
+    value = re.sub(r'\s*year$', '', value, flags=re.I).upper()
+    value = _YEAR_ALIASES.get(value, value)
+    return value if value in YEARS else UNKNOWN
+
+
+def _domain(value):
+    if pd.isna(value):
+        return 'Other'
+    # Multi-valued entries ("Cloud,Fullstack") count towards the first domain.
+    key = re.sub(r'[^a-z]', '', value.split(',')[0].lower())
+    return _DOMAIN_ALIASES.get(key, 'Other')
+
+
+def _identifier(series):
+    series = _text(series).str.upper()
+    return series.mask(series.str.match(_MANGLED_NUMBER).fillna(False))
+
+
+def _student_key(frame):
+    # Reg Number identifies a student unless it was mangled, then Username does.
+    return frame['Reg Number'].fillna('@' + frame['Username'].str.lower())
+
+
+def normalize(raw):
+    """Map a raw contest export onto the canonical schema in ``COLUMNS``."""
+    frame = raw.rename(columns=lambda c: str(c).lstrip('﻿').strip())
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame]
+    if missing:
+        raise ValueError(f'Contest file is missing columns: {", ".join(missing)}')
+    if frame.empty:
+        raise ValueError('Contest file has no rows')
+    for column in COLUMNS:
+        if column not in frame:
+            frame[column] = pd.NA
+
+    clean = pd.DataFrame({
+        'Name': _text(frame['Name']),
+        'Reg Number': _identifier(frame['Reg Number']),
+        'Username': _text(frame['Username']),
+        'Year': _text(frame['Year']).map(_year, na_action=None).astype('string'),
+        'Department': _text(frame['Department']).replace(_DEPARTMENT_ALIASES).fillna(UNKNOWN),
+        'Section': _text(frame['Section']).fillna(UNKNOWN),
+        'Domain': _text(frame['Domain']).map(_domain, na_action=None).astype('string'),
+        'Mail ID': _text(frame['Mail ID']),
+        'Mobile Number': _identifier(frame['Mobile Number'].astype('string').str.removesuffix('.0')),
+    })
+    for column in NUMERIC_COLUMNS:
+        clean[column] = pd.to_numeric(frame[column], errors='coerce').fillna(0).astype(np.int64)
+
+    # Keep one row per student, preferring the row that actually has a rank.  A
+    # row with neither Reg Number nor Username cannot be matched to another.
+    ranked_first = clean.loc[clean['Rank'].eq(0).sort_values(kind='stable').index]
+    key = _student_key(ranked_first)
+    deduped = ranked_first[~(key.duplicated() & key.notna())].sort_index()
+    return deduped.reset_index(drop=True)[COLUMNS]
+
+
+def read_raw(path):
+    return pd.read_csv(path, dtype={'Reg Number': str, 'Mobile Number': str}, encoding='utf-8-sig')
+
+
+def _source(path):
+    # Any other mtime or size means another file, even an older one put back
+    # by ``cp -p``, ``rsync -t`` or a restore.
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns} {stat.st_size}'
+
+
+def ensure(contest):
+    """Ingest ``contest`` unless its stored partition was built from the CSV as it is now.
+
+    Returns the path of the stored partition.
+    """
+    target = store.partition_path(contest.id)
+    source = _source(contest.path)
+    try:
+        with open(store.source_path(contest.id), encoding='ascii') as file:
+            if file.read() == source and os.path.exists(target):
+                return target
+    except FileNotFoundError:
+        pass
+    target = store.write(contest.id, normalize(read_raw(contest.path)))
+    # Recorded after the partition, so an interrupted write is redone.
+    stamp = store.source_path(contest.id)
+    partial = f'{stamp}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(partial, 'w', encoding='ascii') as file:
+        file.write(source)
+    os.replace(partial, stamp)
+    return target
+
+
+# Reasons files could not be ingested, by (path, mtime): a broken file is only
+# parsed again once it changes.  I/O errors may be transient, so they are
+# reported but retried on the next scan.
+_FAILURES = {}
+
+
+def check(contest):
+    """Ingest ``contest`` if needed; return why it cannot be used, or ``None``."""
+    key = (contest.path, os.stat(contest.path).st_mtime_ns)
+    if key in _FAILURES:
+        return _FAILURES[key]
+    try:
+        ensure(contest)
+    except OSError as error:
+        return str(error)
+    except ValueError as error:
+        _FAILURES[key] = str(error)
+        return _FAILURES[key]
+    return None
+
+
+def main():
+    contests, problems = registry.scan()
+    for problem in problems:
+        print(f'warning  {problem}')
+    for contest in contests:
+        rows = store.read(contest.id, columns=['Rank'])
+        print(f'{contest.id:>6}  {len(rows):>6} students  {contest.name}')
+
+
+if __name__ == '__main__':
+    main()
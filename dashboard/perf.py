@@ -0,0 +1,257 @@
+"""Where a page's rerun time goes: named spans, cache hit counts and frame sizes.
+
+A page calls ``start`` first and ``finish`` last.  In between, each stage
+ends with ``perf.lap('load')``, which books the time since the previous lap
+under that name (``with perf.span('load'):`` does the same for a block); the
+shared caches count their hits and misses into the current run
+(``cache_resource``) and ``memory`` records the size of the frames a page
+works on (a dataset measures itself once, see ``ContestDataset.nbytes``).  A fragment decorated with ``perf.fragment`` is a span of the page
+run it belongs to, and a run of its own when it reruns alone.
+
+``finish`` appends the run as one JSON line to ``LOG_PATH`` (set
+``DASHBOARD_PERF_LOG`` to move it, or to an empty string to turn logging
+off), tagged with the deployment (``DASHBOARD_DEPLOYMENT``, else the git
+commit).  Opening a page with ``?perf=1`` shows the run's spans and the
+page's recent p50/p95 in a sidebar panel.
+
+Run ``python -m dashboard.perf`` for p50/p95 rerun latency per deployment
+and page from the log (``--spans`` breaks it down by span).
+"""
+import argparse
+import collections
+import contextlib
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from dashboard import registry
+
+LOG_PATH = os.environ.get('DASHBOARD_PERF_LOG', os.path.join(registry.CACHE_DIR, 'perf.jsonl'))
+# Recent runs per (page, scope) kept in memory for the panel.
+RECENT = 200
+
+_local = threading.local()
+_log_lock = threading.Lock()
+_recent = collections.defaultdict(lambda: collections.deque(maxlen=RECENT))
+
+
+def _deployment():
+    if os.environ.get('DASHBOARD_DEPLOYMENT'):
+        return os.environ['DASHBOARD_DEPLOYMENT']
+    git = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.git')
+    try:
+        with open(os.path.join(git, 'HEAD'), encoding='utf-8') as file:
+            head = file.read().strip()
+        if head.startswith('ref: '):
+            with open(os.path.join(git, head[5:]), encoding='utf-8') as file:
+                head = file.read().strip()
+        return head[:12]
+    except OSError:
+        return 'unknown'
+
+
+DEPLOYMENT = _deployment()
+
+
+class Run:
+
+    def __init__(self, page, scope='page'):
+        self.page = page
+        self.scope = scope
+        self.spans = collections.defaultdict(float)
+        self.cache = collections.defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self.memory = {}
+        self._start = self._lap = time.perf_counter()
+        self.seconds = None
+
+    def record(self):
+        return {
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'deployment': DEPLOYMENT,
+            'page': self.page,
+            'scope': self.scope,
+            'seconds': round(self.seconds, 6),
+            'spans': {name: round(seconds, 6) for name, seconds in self.spans.items()},
+            'cache': dict(self.cache),
+            'memory': self.memory,
+        }
+
+
+def _current():
+    return getattr(_local, 'run', None)
+
+
+def start(page):
+    """Begin timing a full run of ``page``."""
+    _local.run = Run(page)
+    st.session_state['perf_page'] = page
+
+
+def lap(name):
+    """Book the time since the previous lap (or span, or the start) under ``name``."""
+    run = _current()
+    if run is not None:
+        now = time.perf_counter()
+        run.spans[name] += now - run._lap
+        run._lap = now
+
+
+@contextlib.contextmanager
+def span(name):
+    """Time a block of the current run (a no-op outside one)."""
+    run = _current()
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run._lap = time.perf_counter()
+        run.spans[name] += run._lap - start
+
+
+def memory(name, nbytes):
+    """Record ``nbytes`` resident bytes under ``name``."""
+    run = _current()
+    if run is not None:
+        run.memory[name] = int(nbytes)
+
+
+def count(cache, hit):
+    """Count a lookup in ``cache`` towards the current run."""
+    run = _current()
+    if run is not None:
+        run.cache[cache]['hits' if hit else 'misses'] += 1
+
+
+def cache_resource(name, **options):
+    """``st.cache_resource`` that counts its hits and misses under ``name``."""
+    def decorate(func):
+        building = threading.local()
+
+        @functools.wraps(func)
+        def build(*args, **kwargs):
+            building.miss = True
+            return func(*args, **kwargs)
+
+        cached = st.cache_resource(**options)(build)
+
+        @functools.wraps(func)
+        def lookup(*args, **kwargs):
+            building.miss = False
+            value = cached(*args, **kwargs)
+            count(name, not building.miss)
+            return value
+
+        lookup.clear = cached.clear
+        return lookup
+    return decorate
+
+
+def fragment(func):
+    """``st.fragment`` timed as a span of the page run, or as its own run when it reruns alone."""
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is None or not ctx.fragment_ids_this_run:
+            with span(func.__name__):
+                return func(*args, **kwargs)
+        _local.run = Run(st.session_state.get('perf_page', '?'), func.__name__)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _end(_local.run)
+    return st.fragment(timed)
+
+
+def _end(run):
+    _local.run = None
+    run.seconds = time.perf_counter() - run._start
+    record = run.record()
+    _recent[run.page, run.scope].append(record)
+    if LOG_PATH:
+        line = json.dumps(record) + '\n'
+        with _log_lock:
+            os.makedirs(os.path.dirname(LOG_PATH) or '.', exist_ok=True)
+            with open(LOG_PATH, 'a', encoding='utf-8') as file:
+                file.write(line)
+
+
+def finish():
+    """End the current run: log it and, with ``?perf=1``, show the sidebar panel."""
+    run = _current()
+    if run is None:
+        return
+    _end(run)
+    if st.query_params.get('perf') == '1':
+        _panel(run)
+
+
+def _panel(run):
+    with st.sidebar.expander('Performance', expanded=True):
+        st.caption(f'This run: {run.seconds * 1000:.0f} ms (deployment {DEPLOYMENT})')
+        spans = pd.Series(run.spans, dtype=float).mul(1000).round(1)
+        st.dataframe(spans.rename('ms').to_frame(), width='stretch')
+        if run.cache:
+            st.dataframe(pd.DataFrame(run.cache).T, width='stretch')
+        if run.memory:
+            st.dataframe(pd.Series(run.memory).div(2**20).round(2).rename('MiB').to_frame(), width='stretch')
+        rows = []
+        for (page, scope), records in list(_recent.items()):
+            if page == run.page:
+                seconds = np.array([record['seconds'] for record in records]) * 1000
+                rows.append({'scope': scope, 'runs': len(seconds),
+                             'p50 ms': np.percentile(seconds, 50).round(1),
+                             'p95 ms': np.percentile(seconds, 95).round(1)})
+        st.caption(f'Recent runs of this page in this process (last {RECENT} per scope)')
+        st.dataframe(pd.DataFrame(rows).set_index('scope'), width='stretch')
+
+
+def summarize(records, spans=False):
+    """p50/p95 rerun latency in ms per deployment, page and scope (and span with ``spans``)."""
+    rows = []
+    for record in records:
+        base = {'deployment': record['deployment'], 'page': record['page'], 'scope': record['scope']}
+        if spans:
+            rows.extend({**base, 'span': name, 'ms': seconds * 1000} for name, seconds in record['spans'].items())
+        else:
+            rows.append({**base, 'ms': record['seconds'] * 1000})
+    keys = ['deployment', 'page', 'scope'] + (['span'] if spans else [])
+    if not rows:
+        return pd.DataFrame(columns=keys + ['runs', 'p50 ms', 'p95 ms'])
+    groups = pd.DataFrame(rows).groupby(keys, sort=False)['ms']
+    return pd.DataFrame({
+        'runs': groups.size(),
+        'p50 ms': groups.quantile(0.5).round(1),
+        'p95 ms': groups.quantile(0.95).round(1),
+    }).reset_index()
+
+
+def read_log(path=LOG_PATH):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', default=LOG_PATH or os.path.join(registry.CACHE_DIR, 'perf.jsonl'))
+    parser.add_argument('--spans', action='store_true', help='break the latency down by span')
+    parser.add_argument('--deployment', help='only this deployment')
+    args = parser.parse_args()
+    records = read_log(args.log)
+    if args.deployment:
+        records = [record for record in records if record['deployment'] == args.deployment]
+    print(summarize(records, args.spans).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Contest registry.
+
+Discovers the ``w<NNN>.csv`` / ``bw<NNN>.csv`` contest files and maps them to
+the display names shown in the sidebar.  ``version`` ingests a contest on
+demand and returns a token that changes whenever its file does; the shared
+caches (``dashboard.dataset``, ``dashboard.cube``, ...) key on it through
+``per_contest``, so a re-exported file is picked up without restarting the
+server.
+
+A contest file may come with a sidecar ``w<NNN>.json`` holding its display
+``name`` and/or ISO ``date``, for contests off the usual cadence.  ``scan``
+validates every file (ingesting new ones) and reports the ones it cannot use
+instead of failing; ``discover`` only returns usable contests.
+"""
+import functools
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+DATA_DIR = os.environ.get(
+    'CONTEST_DATA_DIR',
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.environ.get('CONTEST_CACHE_DIR', os.path.join(DATA_DIR, '.cache'))
+
+_FILE_PATTERN = re.compile(r'^(bw|w)(\d+)\.csv$')
+_SIDECAR_PATTERN = re.compile(r'^(bw|w)(\d+)\.json$')
+
+_KIND_NAMES = {'w': 'Weekly', 'bw': 'Biweekly'}
+
+# LeetCode runs both series on a fixed cadence, so one known (number, date)
+# pair per series is enough to date every other contest in it.
+_ANCHORS = {
+    'w': (412, date(2024, 8, 25), 7),
+    'bw': (136, date(2024, 8, 3), 14),
+}
+
+
+@dataclass(frozen=True)
+class Contest:
+    id: str
+    kind: str
+    number: int
+    date: date
+    path: str
+    title: str = None
+
+    @property
+    def name(self):
+        if self.title:
+            return self.title
+        return f'Leetcode {_KIND_NAMES[self.kind]} Contest - {self.number} [{self.date:%d.%m.%Y}]'
+
+
+def _contest_date(kind, number):
+    anchor_number, anchor_date, period = _ANCHORS[kind]
+    return anchor_date + timedelta(days=(number - anchor_number) * period)
+
+
+def _sidecar(path):
+    """``(title, date)`` from the sidecar of a contest file, ``(None, None)`` without one."""
+    sidecar = os.path.splitext(path)[0] + '.json'
+    if not os.path.exists(sidecar):
+        return None, None
+    try:
+        with open(sidecar, encoding='utf-8') as file:
+            meta = json.load(file)
+        if not isinstance(meta, dict):
+            raise ValueError('expected a JSON object')
+        title = meta.get('name')
+        if title is not None and not (isinstance(title, str) and title.strip()):
+            raise ValueError('"name" must be a non-empty string')
+        day = date.fromisoformat(meta['date']) if meta.get('date') is not None else None
+    except (OSError, ValueError, TypeError) as error:
+        raise ValueError(f'{os.path.basename(sidecar)}: {error}') from error
+    return title and title.strip(), day
+
+
+def fingerprint(data_dir=DATA_DIR):
+    """Changes whenever a contest file or sidecar is added, removed or rewritten."""
+    return tuple(sorted((entry.name, entry.stat().st_mtime_ns) for entry in os.scandir(data_dir)
+                        if _FILE_PATTERN.match(entry.name) or _SIDECAR_PATTERN.match(entry.name)))
+
+
+def scan(data_dir=DATA_DIR):
+    """Return the usable contests in ``data_dir`` (newest first) and a list of problems.
+
+    New or changed files are ingested here.  A file that cannot be ingested is
+    left out; a broken sidecar only costs the contest its custom name and date.
+    """
+    from dashboard import ingest
+
+    contests, problems = [], []
+    for entry in os.scandir(data_dir):
+        match = _FILE_PATTERN.match(entry.name)
+        if not match or not entry.is_file():
+            continue
+        kind, number = match.group(1), int(match.group(2))
+        try:
+            title, day = _sidecar(entry.path)
+        except ValueError as error:
+            problems.append(str(error))
+            title, day = None, None
+        contest = Contest(id=f'{kind}{number}', kind=kind, number=number,
+                          date=day or _contest_date(kind, number), path=entry.path, title=title)
+        error = ingest.check(contest)
+        if error:
+            problems.append(f'{entry.name}: {error}')
+            continue
+        contests.append(contest)
+    return sorted(contests, key=lambda c: (c.date, c.number), reverse=True), problems
+
+
+def discover(data_dir=DATA_DIR):
+    """Return every usable contest file in ``data_dir``, newest contest first."""
+    return scan(data_dir)[0]
+
+
+# Per data directory: its fingerprint and the contests then on disk by id and
+# by display name, so a lookup only scans the directory after it changed.
+_LOOKUP = {}
+
+
+def get(key, data_dir=DATA_DIR):
+    """Look a contest up by its id (``'w412'``) or its display name."""
+    stamp = fingerprint(data_dir)
+    known = _LOOKUP.get(data_dir)
+    if known is None or known[0] != stamp or key not in known[1]:
+        # Also rescans for an unknown key: a file that failed to ingest may work now.
+        contests = {}
+        for contest in discover(data_dir):
+            contests[contest.id] = contests[contest.name] = contest
+        known = _LOOKUP[data_dir] = (stamp, contests)
+    if key not in known[1]:
+        raise KeyError(f'Unknown contest: {key!r}')
+    return known[1][key]
+
+
+def resolve(contest):
+    """Accept a ``Contest``, id or display name and return the ``Contest``."""
+    return contest if isinstance(contest, Contest) else get(contest)
+
+
+def version(contest):
+    """Ingest ``contest`` if needed and return a token that changes with its data."""
+    from dashboard import ingest
+
+    return os.stat(ingest.ensure(resolve(contest))).st_mtime_ns
+
+
+def per_contest(name, max_entries=64):
+    """Cache ``build(contest_id, version, ...)`` as the shared resource ``name``
+    and return a lookup taking the contest as a ``Contest``, id or display name.
+
+    ``version`` is only part of the cache key: a re-ingested contest gets a
+    fresh value without restarting the server.  ``lookup.build`` is the cache
+    itself, for callers that already hold a version.
+    """
+    from dashboard import perf
+
+    def decorate(build):
+        cached = perf.cache_resource(name, show_spinner=False, max_entries=max_entries)(build)
+
+        @functools.wraps(build)
+        def lookup(contest, *args, **kwargs):
+            contest = resolve(contest)
+            return cached(contest.id, version(contest), *args, **kwargs)
+
+        lookup.build = cached
+        return lookup
+    return decorate
+
@@ -0,0 +1,271 @@
+"""Matplotlib rendering of the downloadable dashboard image, and its cache.
+
+``dashboard_data`` gathers everything the image shows (a handful of counts
+and the top ten rows) so drawing needs no access to session state and can
+run off the script thread.  Drawing goes through the object-oriented API: each
+render owns its ``Figure`` and styles it explicitly, so nothing touches pyplot's
+global figure registry or ``rcParams``, renders can overlap on worker threads,
+and the figure is cleared as soon as it is encoded.
+
+``RenderService`` keeps finished images keyed by (contest, version, department,
+year, domain, format, dpi) in a bounded in-memory LRU backed by
+``.cache/renders/``.  The Download page hands ``RenderService.render`` to its
+button as deferred data, so a full-size image is only rendered once somebody
+asks for it, never for a selection they have already moved on from.
+
+Peak memory of one 25x15in render (measured growth of the process RSS):
+
+    =======  ========  ==========  ========
+    format   dpi       peak        output
+    =======  ========  ==========  ========
+    png      100       ~21 MiB     ~220 KiB
+    png      200       ~64 MiB     ~500 KiB
+    png      300       ~136 MiB    ~780 KiB
+    png      500       ~366 MiB    ~1.5 MiB
+    svg      (vector)  ~5 MiB      ~90 KiB
+    pdf      (vector)  ~15 MiB     ~25 KiB
+    =======  ========  ==========  ========
+
+PNG cost is dominated by the RGBA canvas, ``(25 * dpi) * (15 * dpi) * 4``
+bytes, so it grows with the square of the resolution.
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import matplotlib.colors as mcolors
+import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
+
+from dashboard import figures, perf, registry
+
+FULL_DPI = 500
+PREVIEW_DPI = 60
+DPI_CHOICES = [100, 200, 300, FULL_DPI]
+FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml', 'pdf': 'application/pdf'}
+
+FIGSIZE = (25, 15)
+BACKGROUND = (255/255, 255/255, 224.9/255)  # pale yellow
+FONT = {'fontfamily': 'serif', 'fontsize': 18}
+
+TOP_N = 10
+
+RANK_BINS = [0, 1000, 5000, 10000, 15000, 20000, None]
+RANK_BIN_LABELS = ['0-1000', '1000-5000', '5000-10000', '10000-15000', '15000-20000', '20000+']
+
+VIRIDIS_COLORS = [
+    "#440154",  # Deep purple-blue
+    "#482878",
+    "#3e4989",
+    "#31688e",
+    "#26828e",
+    "#1f9e89",
+    "#35b779",
+    "#6dcd59",
+    "#b4dd2c",
+    "#fde725"   # Vibrant yellow-green
+]
+PLASMA_COLORS = [
+    "#0d0887",  # Deep purple-blue
+    "#46039f",
+    "#7201a8",
+    "#9c179e",
+    "#bd3786",
+    "#d8576b",
+    "#ed7953",
+    "#fb9f3a",
+    "#fdca26",
+    "#f0f921"   # Vibrant yellow-green
+]
+
+@dataclass
+class DashboardData:
+    title: str
+    presence: pd.Series
+    problems: pd.Series
+    top: pd.DataFrame
+    rank_ranges: pd.Series
+
+
+def title(contest_name, department, year):
+    return (f'{contest_name} ({department if department != "All" else "All Depts."}) '
+            f'[{year if year != "All" else "All Years"}]')
+
+
+def dashboard_data(title, view, top):
+    """Collect the image's inputs from a cube slice and the best participants (best first)."""
+    presence = pd.Series({'Present': view.present, 'Absent': view.absent})
+    return DashboardData(
+        title=title,
+        presence=presence[presence > 0],
+        problems=view.prob_counts(),
+        top=top[['Name', 'Rank']],
+        rank_ranges=view.rank_bins(RANK_BINS, RANK_BIN_LABELS),
+    )
+
+
+def selection_data(contest_name, frame, index, contest_cube, ranking,
+                   year='All', department='All', domain='All'):
+    """``dashboard_data`` for one Year/Department/Domain selection of a contest."""
+    selection = dict(year=year, department=department, domain=domain)
+    return dashboard_data(title(contest_name, department, year), contest_cube.select(**selection),
+                          frame.iloc[ranking.top(TOP_N, index.rows(**selection))])
+
+
+def _draw(data):
+    fig = Figure(figsize=FIGSIZE, facecolor=BACKGROUND)
+    axs = fig.subplots(2, 2)
+    for ax in axs.flat:
+        ax.tick_params(labelsize=FONT['fontsize'], labelfontfamily=FONT['fontfamily'])
+
+    # Plot 1: Presence Distribution (Pie Chart)
+    colors = {'Present': 'green', 'Absent': 'red'}
+    colors = [mcolors.to_rgba(colors[presence], alpha=0.5) for presence in data.presence.index]
+    axs[0, 0].pie(data.presence, labels=[f"{presence} ({count})" for presence, count in data.presence.items()],
+                  autopct='%1.1f%%', colors=colors, textprops=FONT)
+    axs[0, 0].set_title('Presence Distribution', **FONT)
+
+    # Plot 2: Problems Solved Count (Bar Chart)
+    colors = ['red', 'brown', 'orange', 'yellow', 'green']
+    axs[0, 1].bar(data.problems.index, data.problems.values, color=colors)
+    axs[0, 1].set_title('Problems Solved', **FONT)
+    # Display problem-wise counts
+    for problems, count in data.problems.items():
+        axs[0, 1].text(problems, count, str(count), ha='center', va='bottom', **FONT)
+
+    # Plot 3: Top 10 Performers (Rank Performance), best at the top
+    top = data.top[::-1]
+    names_with_ranks = [f"{name}\n ({figures.ordinal(len(top) - i)} Rank)" for i, name in enumerate(top['Name'])]
+    axs[1, 0].barh(names_with_ranks, top['Rank'], color=VIRIDIS_COLORS[:len(top)])
+    axs[1, 0].set_xlabel('Ranking Score', **FONT)
+    axs[1, 0].set_ylabel('Name', **FONT)
+    axs[1, 0].set_title('Top 10 Performers', **FONT)
+    # Display the rank above each bar
+    for i, rank in enumerate(top['Rank']):
+        axs[1, 0].text(rank, i, str(rank), ha='left', va='bottom', **FONT)
+
+    # Plot 4: Rank Range Distribution
+    labels = list(data.rank_ranges.index)
+    axs[1, 1].bar(labels, data.rank_ranges.values, color=PLASMA_COLORS[:len(labels)])
+    axs[1, 1].set_xticks(range(len(labels)), labels, rotation=45)
+    axs[1, 1].set_title('Rank Range Distribution', **FONT)
+    # Display the count above each bar
+    for label, count in data.rank_ranges.items():
+        axs[1, 1].text(label, count, str(count), ha='center', va='bottom', **FONT)
+
+    fig.suptitle(data.title, fontsize=40, fontfamily=FONT['fontfamily'], y=.96, fontweight='bold',
+                 color='black', style='italic',
+                 bbox=dict(facecolor='none', edgecolor='none', boxstyle='round,pad=0.5'))
+    return fig
+
+
+def render_image(data, fmt='png', dpi=FULL_DPI):
+    """Draw the dashboard image and return it encoded as ``fmt``.
+
+    ``dpi`` only matters for PNG; SVG and PDF are vector output.
+    """
+    stream = io.BytesIO()
+    fig = _draw(data)
+    try:
+        fig.savefig(stream, format=fmt, dpi=dpi, facecolor=fig.get_facecolor())
+    finally:
+        # Drop the artists (and with them the Agg buffer) now rather than at the next GC.
+        fig.clear()
+    return stream.getvalue()
+
+
+class RenderService:
+    """Bounded memory + disk cache of rendered images."""
+
+    def __init__(self, cache_dir, max_memory_bytes=256 * 2**20, max_disk_bytes=2**30):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        # Keys end in (fmt, dpi).
+        return os.path.join(self.cache_dir, f'{hashlib.sha1(repr(key).encode()).hexdigest()}.{key[-2]}')
+
+    def get(self, key):
+        """Cached bytes for ``key`` from memory or disk, else ``None``."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                image = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+        self._remember(key, image)
+        return image
+
+    @staticmethod
+    def _image_key(key, fmt, dpi):
+        # Vector output does not depend on the resolution.
+        return key + (fmt, dpi if fmt == 'png' else None)
+
+    def render(self, key, data, dpi=FULL_DPI, fmt='png'):
+        """Return the image for ``key`` as ``fmt``, rendering it on this thread if needed."""
+        image_key = self._image_key(key, fmt, dpi)
+        image = self.get(image_key)
+        perf.count('images', image is not None)
+        if image is None:
+            with self._lock:
+                self.misses += 1
+            image = render_image(data, fmt, image_key[-1])
+            self._remember(image_key, image)
+            self._persist(image_key, image)
+        return image
+
+    def _remember(self, key, image):
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = image
+            self._memory_size += len(image)
+            while self._memory_size > self.max_memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def _persist(self, key, image):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        partial = f'{path}.{threading.get_ident()}.tmp'
+        with open(partial, 'wb') as file:
+            file.write(image)
+        os.replace(partial, path)
+        # Evict the least recently used files once over budget.
+        entries = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                         for entry in os.scandir(self.cache_dir) if not entry.name.endswith('.tmp'))
+        total = sum(size for _, size, _ in entries)
+        for _, size, stale in entries:
+            if total <= self.max_disk_bytes or stale == path:
+                break
+            os.remove(stale)
+            total -= size
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._memory),
+                    'bytes': self._memory_size}
+
+
+@st.cache_resource(show_spinner=False)
+def service():
+    """The process-wide render service."""
+    return RenderService(os.path.join(registry.CACHE_DIR, 'renders'))
@@ -0,0 +1,90 @@
+"""Substring search over student names, usernames and registration numbers.
+
+Every 1-, 2- and 3-character gram of the lower-cased ``Name``, ``Username`` and
+``Reg Number`` maps to the sorted ids of the rows containing it.  Queries of
+up to three characters are a single lookup.  Longer queries intersect the
+posting lists of their trigrams, starting with the rarest, and check the few
+remaining candidates with a plain substring test.
+
+Row ids line up with ``dashboard.dataset`` and ``dashboard.filters``, so results
+compose with a filter selection through ``within``.
+"""
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dashboard import registry, store
+
+FIELDS = ['Name', 'Username', 'Reg Number']
+GRAM = 3
+
+# Separates the fields of a row so no match spans two of them.
+_SEPARATOR = '\x00'
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace."""
+    return ' '.join(str(text).split()).lower()
+
+
+def _postings(columns, size):
+    """Sorted row ids per gram of the normalized ``columns``.
+
+    Each gram length and start offset is one arrow slice over a whole column;
+    the (gram, row) pairs are then sorted and deduplicated together.
+    """
+    grams, rows = [], []
+    for column in columns:
+        field = pa.array(column, pa.string())
+        lengths = pc.utf8_length(field).to_numpy()
+        for n in range(1, GRAM + 1):
+            for start in range(lengths.max(initial=0) - n + 1):
+                long_enough = lengths >= start + n
+                grams.append(pc.utf8_slice_codeunits(field, start, start + n).filter(long_enough))
+                rows.append(np.flatnonzero(long_enough))
+    if not grams:
+        return {}
+    encoded = pc.dictionary_encode(pa.concat_arrays(grams))
+    keys = np.sort(encoded.indices.to_numpy().astype(np.int64) * size + np.concatenate(rows))
+    keys = keys[np.diff(keys, prepend=-1) != 0]
+    codes, rows = np.divmod(keys, size)
+    starts = np.flatnonzero(np.diff(codes, prepend=-1))
+    return dict(zip(encoded.dictionary.take(codes[starts]).to_pylist(),
+                    np.split(rows.astype(np.int32), starts[1:])))
+
+
+class SearchIndex:
+
+    def __init__(self, frame):
+        self.size = len(frame)
+        columns = [frame[field].fillna('').map(normalize) for field in FIELDS]
+        self._texts = [_SEPARATOR.join(values) for values in zip(*columns)]
+        self._postings = _postings(columns, self.size)
+        self._empty = np.array([], dtype=np.int32)
+
+    def rows(self, query, within=None):
+        """Sorted ids of the rows with ``query`` in one of their fields, optionally
+        restricted to the sorted row ids ``within``."""
+        query = normalize(query)
+        if not query:
+            rows = np.arange(self.size, dtype=np.int32)
+        elif len(query) <= GRAM:
+            rows = self._postings.get(query, self._empty)
+        else:
+            grams = sorted({query[i:i + GRAM] for i in range(len(query) - GRAM + 1)},
+                           key=lambda gram: len(self._postings.get(gram, self._empty)))
+            rows = self._postings.get(grams[0], self._empty)
+            for gram in grams[1:]:
+                if not len(rows):
+                    break
+                rows = np.intersect1d(rows, self._postings.get(gram, self._empty), assume_unique=True)
+            rows = np.array([row for row in rows if query in self._texts[row]], dtype=np.int32)
+        if within is not None:
+            rows = np.intersect1d(rows, within, assume_unique=True)
+        return rows
+
+
+@registry.per_contest('search')
+def for_contest(contest_id, version):
+    """The (shared, read-only) search index of a contest given as ``Contest``, id or name."""
+    return SearchIndex(store.read(contest_id, columns=FIELDS))
@@ -0,0 +1,82 @@
+"""Sidebar widgets shared by every page."""
+import streamlit as st
+
+from dashboard import filters, registry
+
+# Seconds between checks of the data directory for new or changed contest files.
+WATCH_INTERVAL = 30
+
+
+ALL_CONTESTS = 'All Contests'
+DATE_RANGE = 'Contests in a Date Range'
+AGGREGATES = (ALL_CONTESTS, DATE_RANGE)
+
+
+def select_contest(aggregates=False):
+    """Render the contest selectbox and return the chosen display name.
+
+    With ``aggregates`` the box also offers ``ALL_CONTESTS`` and ``DATE_RANGE``;
+    ``contests_for`` turns any choice into the contests it covers.
+    """
+    options = [contest.name for contest in watch_contests()]
+    if aggregates:
+        options += AGGREGATES
+    return st.sidebar.selectbox(label='Select Contest Name', options=options)
+
+
+def watch_contests():
+    """Return the usable contests, warn about unusable files and keep watching the directory."""
+    contests, problems = registry.scan()
+    for problem in problems:
+        st.sidebar.warning(problem, icon='⚠️')
+    _rerun_on_change(registry.fingerprint())
+    return contests
+
+
+@st.fragment(run_every=WATCH_INTERVAL)
+def _rerun_on_change(fingerprint):
+    # Runs on its own every WATCH_INTERVAL seconds and reruns the whole page once
+    # contest files appear or change, so open sessions pick them up without a reload.
+    if registry.fingerprint() != fingerprint:
+        st.rerun()
+
+
+def contests_for(option):
+    """The contests covered by a ``select_contest`` choice, newest first.
+
+    ``DATE_RANGE`` renders a date picker over the contests on disk.
+    """
+    contests = registry.discover()
+    if option == ALL_CONTESTS:
+        return contests
+    if option != DATE_RANGE:
+        return [registry.get(option)]
+    dates = [contest.date for contest in contests]
+    picked = st.sidebar.date_input('Contest Dates', value=(min(dates), max(dates)),
+                                   min_value=min(dates), max_value=max(dates), format='DD.MM.YYYY')
+    # While the second date is being picked the range is open-ended.
+    start, end = (picked[0], picked[-1]) if picked else (min(dates), max(dates))
+    return [contest for contest in contests if start <= contest.date <= end]
+
+
+def _remembered_selectbox(label, options, key):
+    # Keep the choice across pages and contests while it is still on offer.
+    current = st.session_state.get(key)
+    index = options.index(current) if current in options else 0
+    value = st.session_state[key] = st.sidebar.selectbox(label, options, index=index)
+    return value
+
+
+def cascade_filters(index):
+    """Render the Year -> Department -> Domain selectors for a ``FilterIndex``.
+
+    Each selector only offers values that still have students under the
+    selections above it.  Returns the selection as ``year``/``department``/
+    ``domain`` keyword arguments.
+    """
+    st.sidebar.header("Filter Data")
+    selection = {}
+    for field in filters.FIELDS:
+        key = filters.KEYS[field]
+        selection[key] = _remembered_selectbox(field, index.options(field, **selection), key)
+    return selection
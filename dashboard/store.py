@@ -0,0 +1,61 @@
+"""Columnar contest store.
+
+Canonical contest frames are kept as a Hive-partitioned Parquet dataset under
+``.cache/store/contest=<id>/``.  Readers ask for the columns they render and,
+optionally, a row predicate; both are pushed down to Parquet so e.g. the
+Dashboard never decodes ``Mobile Number`` or ``Mail ID``.
+
+Filters use the pyarrow DNF form, e.g. ``[('Rank', '>', 0), ('Year', '=', 'II')]``.
+
+Next to each partition ``_source`` records which CSV it was built from; dataset
+discovery skips names starting with ``_``.
+"""
+import os
+import threading
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from dashboard import registry
+
+STORE_DIR = os.path.join(registry.CACHE_DIR, 'store')
+
+PART_NAME = 'part-0.parquet'
+SOURCE_NAME = '_source'
+
+
+def partition_path(contest_id, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f'contest={contest_id}', PART_NAME)
+
+
+def source_path(contest_id, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f'contest={contest_id}', SOURCE_NAME)
+
+
+def write(contest_id, frame, store_dir=STORE_DIR):
+    """Persist one contest's canonical frame as its own partition."""
+    target = partition_path(contest_id, store_dir)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # Write-then-rename so a concurrent reader never sees a half-written file;
+    # the name is per thread, as the warm-up may ingest alongside a page.
+    partial = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+    frame.to_parquet(partial, index=False, compression='zstd')
+    os.replace(partial, target)
+    return target
+
+
+def read(contest_id, columns=None, filters=None, store_dir=STORE_DIR):
+    """Read one contest, projecting ``columns`` and applying ``filters``."""
+    table = pq.read_table(partition_path(contest_id, store_dir), columns=columns, filters=filters)
+    return table.to_pandas()
+
+
+def read_many(contest_ids, columns=None, filters=None, store_dir=STORE_DIR):
+    """Read several contests at once; the result carries a ``contest`` column."""
+    dataset = ds.dataset(store_dir, format='parquet', partitioning='hive')
+    expression = ds.field('contest').isin(list(contest_ids))
+    if filters:
+        expression &= pq.filters_to_expression(filters)
+    if columns is not None:
+        columns = list(columns) + ['contest']
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
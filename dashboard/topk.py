@@ -0,0 +1,50 @@
+"""Top-K performers from a presorted rank order.
+
+Each contest keeps the row ids of its participants (``Rank > 0``) sorted by
+rank once.  The best K of any filter selection are then the first K ids of
+that order that fall in the selection: one ordered scan, no sort per rerun.
+"""
+import numpy as np
+
+from dashboard import registry, store
+
+
+class TopK:
+
+    def __init__(self, frame):
+        rank = frame['Rank'].to_numpy()
+        self.size = len(rank)
+        present = np.flatnonzero(rank > 0)
+        self.order = present[np.argsort(rank[present], kind='stable')]
+
+    def ranked(self, rows=None):
+        """Row ids of the participants among ``rows`` (all rows if ``None``), best first."""
+        if rows is None:
+            return self.order
+        selected = np.zeros(self.size, dtype=bool)
+        selected[rows] = True
+        return self.order[selected[self.order]]
+
+    def count(self, rows=None):
+        return len(self.ranked(rows))
+
+    def top(self, k, rows=None, page=1, page_size=None):
+        """Row ids of the best ``k`` participants among ``rows``, or of one page of them."""
+        ranked = self.ranked(rows)[:max(int(k), 0)]
+        if page_size is None:
+            return ranked
+        start = (page - 1) * page_size
+        return ranked[start:start + page_size]
+
+    def positions(self, of, rows=None):
+        """1-based position of each row id in ``of`` among the participants in ``rows``; 0 if absent."""
+        ranked = self.ranked(rows)
+        position = np.zeros(self.size, dtype=np.int32)
+        position[ranked] = np.arange(1, len(ranked) + 1)
+        return position[of]
+
+
+@registry.per_contest('topk')
+def for_contest(contest_id, version):
+    """The (shared, read-only) rank order of a contest given as ``Contest``, id or name."""
+    return TopK(store.read(contest_id, columns=['Rank']))
@@ -0,0 +1,98 @@
+"""Preload the newest contests into the shared caches on a background thread.
+
+After a restart the first visitor would otherwise pay for reading a contest
+and building its dataset, filter index, count cube, top-K order and search
+index (plus the cross-contest history behind Student Trends and the chronic
+absentee view).  ``start`` builds all of that for the ``NEWEST`` contests on
+a daemon thread, once per server process: ``serve.py`` calls it before the
+server takes its first connection, and the Dashboard calls it on every run
+in case the app was started with plain ``streamlit run`` (a no-op once
+started).  A page that needs a contest still being warmed simply waits on
+the same cache entry instead of building it a second time.
+
+Run ``python -m dashboard.warmup`` to time a warm-up without a server.
+"""
+import argparse
+import threading
+import time
+
+import streamlit as st
+
+from dashboard import cube, dataset, figures, filters, history, registry, render, search, topk
+
+# Contests preloaded at startup, newest first; the Dashboard opens on the newest.
+NEWEST = 3
+
+
+def warm(contest):
+    """Build every shared per-contest structure of ``contest``; returns the seconds taken."""
+    start = time.perf_counter()
+    dataset.for_contest(contest)
+    index = filters.for_contest(contest)
+    contest_cube = cube.for_contest(contest)
+    ranking = topk.for_contest(contest)
+    search.for_contest(contest)
+    _dashboard_figures(contest, contest_cube, ranking.top(render.TOP_N, index.rows()))
+    return time.perf_counter() - start
+
+
+def _dashboard_figures(contest, contest_cube, top):
+    # The Dashboard's charts for every filter on 'All'; building Plotly figures
+    # is most of a warm page's time.
+    data = dataset.for_contest(contest)
+    figures.dashboard((data.contest_id, data.version), dict.fromkeys(filters.KEYS.values(), 'All'),
+                      contest_cube, contest_cube.select(), lambda: data.frame.iloc[top])
+
+
+class Warmup:
+
+    def __init__(self, newest=NEWEST):
+        self.newest = newest
+        # Seconds per step: a contest's display name, or 'history'.
+        self.timings = {}
+        self.duration = None
+        self.error = None
+        self.done = threading.Event()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            for contest in registry.discover()[:self.newest]:
+                self.timings[contest.name] = warm(contest)
+            step = time.perf_counter()
+            history.current()
+            self.timings['history'] = time.perf_counter() - step
+        except Exception as error:
+            # Pages build whatever is missing on demand; a failed warm-up only costs time.
+            self.error = error
+        finally:
+            self.duration = time.perf_counter() - start
+            self.done.set()
+        print(self.summary(), flush=True)
+
+    def summary(self):
+        if not self.done.is_set():
+            return f'warming up the {self.newest} newest contests...'
+        steps = ', '.join(f'{name} {seconds:.2f}s' for name, seconds in self.timings.items())
+        failed = f'; failed: {self.error}' if self.error else ''
+        return f'warm-up finished in {self.duration:.2f}s ({steps}){failed}'
+
+
+@st.cache_resource(show_spinner=False)
+def start(_newest=NEWEST):
+    """Start warming the newest contests, once per process; returns the ``Warmup``."""
+    # The underscore keeps the count out of the cache key: the first call wins.
+    warmup = Warmup(_newest)
+    threading.Thread(target=warmup.run, name='cache-warmup', daemon=True).start()
+    return warmup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--newest', type=int, default=NEWEST, help='number of contests to preload')
+    args = parser.parse_args()
+    Warmup(args.newest).run()
+
+
+if __name__ == '__main__':
+    main()
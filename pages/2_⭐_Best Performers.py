@@ -1,112 +1,74 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-st.session_state.data_option = st.sidebar.selectbox(label='Select Contest Name', options=[
-    'Leetcode Weekly Contest - 412 [25.08.2024]',
-    'Leetcode Weekly Contest - 411 [18.08.2024]',
-    'Leetcode Weekly Contest - 410 [11.08.2024]',
-    'Leetcode Weekly Contest - 409 [04.08.2024]',
-    'Leetcode Biweekly Contest - 136 [03.08.2024]',
-    'Leetcode Weekly Contest - 408 [28.07.2024]',
-    'Leetcode Weekly Contest - 407 [21.07.2024]',
-    'Leetcode Weekly Contest - 406 [14.07.2024]',
-    'Leetcode Weekly Contest - 405 [07.07.2024]',
-    'Leetcode Biweekly Contest - 134 [06.07.2024]',
-    'Leetcode Biweekly Contest - 130 [11.05.2024]',
-    'Leetcode Weekly Contest - 397 [12.05.2024]'
-])
+from dashboard import dataset, filters, perf, registry, search, sidebar, topk
+
+PAGE_SIZE = 50
+COLUMNS = ['Name', 'Year', 'Domain', 'Department', 'Score', 'ProbCount', 'Rank']
+
+
+@perf.fragment
+def find_student(data, search_index, ranking, selected_rows):
+    query = st.text_input("Find Student", help='Name, username or registration number.')
+    if query:
+        st.subheader('Search Results')
+        found_rows = search_index.rows(query, within=selected_rows)
+        # Position among the selected participants, as numbered in the top list below.
+        positions = ranking.positions(found_rows, selected_rows)
+        order = np.argsort(np.where(positions > 0, positions, np.iinfo(np.int32).max), kind='stable')
+        found = data.iloc[found_rows[order]]
+        found.index = [str(position) if position else 'Absent' for position in positions[order]]
+        st.table(found[['Name', 'Username'] + COLUMNS[1:]])
+
+
+@perf.fragment
+def top_performers(data, ranking, selected_rows):
+    # Top N Performers, PAGE_SIZE per page
+    participants = ranking.count(selected_rows)
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        num = st.number_input("Top, How Many?", min_value=1, max_value=max(participants, 1),
+                              value=min(10, max(participants, 1)), step=1)
+    pages = -(-num // PAGE_SIZE)
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1) if pages > 1 else 1
+    st.subheader(f'Top {num} Performers')
+    top = data.iloc[ranking.top(num, selected_rows, page, PAGE_SIZE)]
+    top.index = range((page - 1) * PAGE_SIZE + 1, (page - 1) * PAGE_SIZE + len(top) + 1)
+    st.table(top[COLUMNS])
+
+
+perf.start('Best Performers')
+st.session_state.data_option = sidebar.select_contest()
+perf.lap('select contest')
 
 #Load data once
 if st.session_state.get('data_option'):
-    if st.session_state.data_option == 'Leetcode Biweekly Contest - 130 [11.05.2024]':
-        st.session_state.data = pd.read_csv('bw130.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 397 [12.05.2024]':
-        st.session_state.data = pd.read_csv('w397.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 405 [07.07.2024]':
-        st.session_state.data = pd.read_csv('w405.csv')
-    elif st.session_state.data_option == 'Leetcode Biweekly Contest - 134 [06.07.2024]':
-        st.session_state.data = pd.read_csv('bw134.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 406 [14.07.2024]':
-        st.session_state.data = pd.read_csv('w406.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 407 [21.07.2024]':
-        st.session_state.data = pd.read_csv('w407.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 408 [28.07.2024]':
-        st.session_state.data = pd.read_csv('w408.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 409 [04.08.2024]':
-        st.session_state.data = pd.read_csv('w409.csv')
-    elif st.session_state.data_option == 'Leetcode Biweekly Contest - 136 [03.08.2024]':
-        st.session_state.data = pd.read_csv('bw136.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 410 [11.08.2024]':
-        st.session_state.data = pd.read_csv('w410.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 411 [18.08.2024]':
-        st.session_state.data = pd.read_csv('w411.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 412 [25.08.2024]':
-        st.session_state.data = pd.read_csv('w412.csv')
+    contest = registry.get(st.session_state.data_option)
+    contest_data = dataset.for_contest(contest)
     
     st.sidebar.header(st.session_state.data_option)
     
-    # Load data
-    data = st.session_state.data
+    data = contest_data.frame
+    perf.memory('contest', contest_data.nbytes)
+    perf.lap('load')
     
     st.header("Best Performer Details:")
     
     #st.set_page_config(layout="wide")
     
-    # Define unique values for filters
-    departments = ["All"] + list(data['Department'].unique())
-    years = ["All"] + list(data['Year'].unique())
-    domains = ["All"] + list(data['Domain'].unique())
-    
     # Sidebar layout
-    st.sidebar.header("Filter Data")
-    years = ["All"] + list(st.session_state.data['Year'].unique())
-    year_val = st.session_state.get('year')
-    year = st.session_state.year = st.sidebar.selectbox('Year', years, index=0 if not year_val else years.index(year_val))
-    
-    departments = ["All"] + list(st.session_state.data['Department'].unique())
-    
-    if year != 'All':
-        departments = ["All"] + list(st.session_state.data[data.Year == year]['Department'].unique())
-    
-    dept_val = st.session_state.get('department')
-    department = st.session_state.department = st.sidebar.selectbox('Department', departments, index=0 if not dept_val else departments.index(dept_val))
-    
-    domains = ["All"] + list(st.session_state.data['Domain'].unique())
-    
-    if year != 'All' and department == 'All':
-        domains = ["All"] + list(st.session_state.data[data.Year == year]['Domain'].unique())
-    elif year != 'All' and department != 'All':
-        domains = ["All"] + list(st.session_state.data[(data.Year == year) & (data.Department == department)]['Domain'].unique())
-    
-    domain_val = st.session_state.get('domain')
-    domain = st.session_state.domain = st.sidebar.selectbox('Domain', domains, index=0 if not domain_val else domains.index(domain_val))
+    filter_index = filters.for_contest(contest)
+    selection = sidebar.cascade_filters(filter_index)
     # Filter data based on selections
-    filtered_data = data.copy()
-    if year != 'All':
-        filtered_data = filtered_data[filtered_data['Year'] == year]
-    if department != 'All':
-        filtered_data = filtered_data[filtered_data['Department'] == department]
-    if domain != 'All':
-        filtered_data = filtered_data[filtered_data['Domain'] == domain]
-    
-    num = st.sidebar.text_input("Top, How Many?")
-    
-    if num:
-        # Top 10 Performers
-        st.subheader(f'Top {num} Performers')
-        filtered_no_zero = filtered_data[filtered_data['Rank'] > 0]
-        sorted_filtered = filtered_no_zero.sort_values(by='Rank')
-        top_10_performers = sorted_filtered.head(int(num))
-        top_10_performers.index = range(1, len(top_10_performers) + 1)
-        st.table(top_10_performers[['Name', 'Year', 'Domain', 'Department', 'Score', 'ProbCount', 'Rank']])
-    else:
-        # Top 10 Performers
-        st.subheader(f'Top 10 Performers')
-        filtered_no_zero = filtered_data[filtered_data['Rank'] > 0]
-        sorted_filtered = filtered_no_zero.sort_values(by='Rank')
-        top_10_performers = sorted_filtered.head(10)
-        top_10_performers.index = range(1, len(top_10_performers) + 1)
-        st.table(top_10_performers[['Name', 'Year', 'Domain', 'Department', 'Score', 'ProbCount', 'Rank']])
+    selected_rows = filter_index.rows(**selection)
     
+    ranking = topk.for_contest(contest)
+    perf.lap('filters')
     
+    # The search and the top list rerun on their own when their inputs change;
+    # the contest and the sidebar filters above feed them through the arguments.
+    find_student(data, search.for_contest(contest), ranking, selected_rows)
+    top_performers(data, ranking, selected_rows)
+
+perf.finish()
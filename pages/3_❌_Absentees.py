@@ -1,117 +1,115 @@
+import functools
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-st.session_state.data_option = st.sidebar.selectbox(label='Select Contest Name', options=[
-    'Leetcode Weekly Contest - 412 [25.08.2024]',
-    'Leetcode Weekly Contest - 411 [18.08.2024]',
-    'Leetcode Weekly Contest - 410 [11.08.2024]',
-    'Leetcode Weekly Contest - 409 [04.08.2024]',
-    'Leetcode Biweekly Contest - 136 [03.08.2024]',
-    'Leetcode Weekly Contest - 408 [28.07.2024]',
-    'Leetcode Weekly Contest - 407 [21.07.2024]',
-    'Leetcode Weekly Contest - 406 [14.07.2024]',
-    'Leetcode Weekly Contest - 405 [07.07.2024]',
-    'Leetcode Biweekly Contest - 134 [06.07.2024]',
-    'Leetcode Biweekly Contest - 130 [11.05.2024]',
-    'Leetcode Weekly Contest - 397 [12.05.2024]'
-])
+
+from dashboard import absentees, dataset, filters, history, perf, registry, sidebar
+
+
+@perf.fragment
+def absentee_table(contest_data, filter_index, selection):
+    # Reruns on its own for a new name, page size or page; the sidebar filters
+    # feed it through ``selection``.
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        name = st.text_input('Name', help='Also matches username and registration number.')
+
+    # Absentees are kept as row ids; only the page on screen is materialized.
+    absent_rows = absentees.rows(contest_data, filter_index, name, **selection)
+
+    with col2:
+        page_size = st.selectbox("Absentees per Page", absentees.PAGE_SIZES, index=1)
+    pages = absentees.page_count(len(absent_rows), page_size)
+    if st.session_state.get('absentee_page', 1) > pages:
+        st.session_state.absentee_page = 1
+    with col3:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key='absentee_page')
+
+    shown = absentees.page(contest_data, absent_rows, page, page_size)
+    if len(shown):
+        st.caption(f"Showing {shown.index[0] + 1}-{shown.index[-1] + 1} of {len(absent_rows)} absentees "
+                   f"(page {page} of {pages})")
+    st.table(shown)
+
+    # The CSV is only written when the button is clicked, then cached per contest and filters.
+    st.download_button(
+        label="Download Absentee data",
+        data=functools.partial(absentees.csv, contest_data.contest_id, name=name, **selection),
+        file_name='LeetCode Weekly Contest Absentees.csv',
+        mime='text/csv',
+    )
+
+
+@perf.fragment
+def chronic_table(snapshot, selected_rows, selection):
+    # Reruns on its own when the window, thresholds or page change.
+    contests = len(snapshot.contests)
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        last = st.number_input("Absent in the Last N Contests", min_value=1, max_value=contests,
+                               value=min(5, contests), step=1)
+    with col2:
+        min_absent = st.number_input("At Least K of Them", min_value=1, max_value=last, value=last, step=1)
+    with col3:
+        min_streak = st.number_input("Current Streak of at Least", min_value=0, max_value=contests,
+                                     value=0, step=1)
+
+    chronic_absentees = absentees.chronic(snapshot, selected_rows, last, min_absent, min_streak)
+    st.caption(f"{len(chronic_absentees)} students absent from at least {min_absent} of the last {last} contests")
+
+    col1, col2, _ = st.columns([1, 1, 1])
+    with col1:
+        page_size = st.selectbox("Absentees per Page", absentees.PAGE_SIZES, index=1)
+    pages = absentees.page_count(len(chronic_absentees), page_size)
+    if st.session_state.get('chronic_page', 1) > pages:
+        st.session_state.chronic_page = 1
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key='chronic_page')
+    st.table(chronic_absentees[(page - 1) * page_size:page * page_size])
+
+    st.download_button(
+        label="Download Chronic Absentee data",
+        data=functools.partial(absentees.chronic_csv, snapshot.key, last, min_absent, min_streak, **selection),
+        file_name='LeetCode Chronic Absentees.csv',
+        mime='text/csv',
+    )
+
+
+perf.start('Absentees')
+st.session_state.data_option = sidebar.select_contest()
+chronic = st.sidebar.toggle("Chronic Absentees", help='Students who miss contest after contest, across all contests.')
+perf.lap('select contest')
 
 #Load data once
-if st.session_state.get('data_option'):
-    if st.session_state.data_option == 'Leetcode Biweekly Contest - 130 [11.05.2024]':
-        st.session_state.data = pd.read_csv('bw130.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 397 [12.05.2024]':
-        st.session_state.data = pd.read_csv('w397.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 405 [07.07.2024]':
-        st.session_state.data = pd.read_csv('w405.csv')
-    elif st.session_state.data_option == 'Leetcode Biweekly Contest - 134 [06.07.2024]':
-        st.session_state.data = pd.read_csv('bw134.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 406 [14.07.2024]':
-        st.session_state.data = pd.read_csv('w406.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 407 [21.07.2024]':
-        st.session_state.data = pd.read_csv('w407.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 408 [28.07.2024]':
-        st.session_state.data = pd.read_csv('w408.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 409 [04.08.2024]':
-        st.session_state.data = pd.read_csv('w409.csv')
-    elif st.session_state.data_option == 'Leetcode Biweekly Contest - 136 [03.08.2024]':
-        st.session_state.data = pd.read_csv('bw136.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 410 [11.08.2024]':
-        st.session_state.data = pd.read_csv('w410.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 411 [18.08.2024]':
-        st.session_state.data = pd.read_csv('w411.csv')
-    elif st.session_state.data_option == 'Leetcode Weekly Contest - 412 [25.08.2024]':
-        st.session_state.data = pd.read_csv('w412.csv')
+if st.session_state.get('data_option') and not chronic:
+    contest = registry.get(st.session_state.data_option)
+    contest_data = dataset.for_contest(contest)
     
     st.sidebar.header(st.session_state.data_option)
-    
-    data = st.session_state.data
+    perf.lap('load')
     
     #st.set_page_config(layout="wide")
     
     st.header("Absentee Details:")
     
-    # Define unique values for filters
-    departments = ["All"] + list(data['Department'].unique())
-    years = ["All"] + list(data['Year'].unique())
-    domains = ["All"] + list(data['Domain'].unique())
-    
     # Sidebar layout
-    st.sidebar.header("Filter Data")
-    years = ["All"] + list(st.session_state.data['Year'].unique())
-    year_val = st.session_state.get('year')
-    year = st.session_state.year = st.sidebar.selectbox('Year', years, index=0 if not year_val else years.index(year_val))
-    
-    departments = ["All"] + list(st.session_state.data['Department'].unique())
-    
-    if year != 'All':
-        departments = ["All"] + list(st.session_state.data[data.Year == year]['Department'].unique())
-    
-    dept_val = st.session_state.get('department')
-    department = st.session_state.department = st.sidebar.selectbox('Department', departments, index=0 if not dept_val else departments.index(dept_val))
-    
-    domains = ["All"] + list(st.session_state.data['Domain'].unique())
-    
-    if year != 'All' and department == 'All':
-        domains = ["All"] + list(st.session_state.data[data.Year == year]['Domain'].unique())
-    elif year != 'All' and department != 'All':
-        domains = ["All"] + list(st.session_state.data[(data.Year == year) & (data.Department == department)]['Domain'].unique())
-    
-    domain_val = st.session_state.get('domain')
-    domain = st.session_state.domain = st.sidebar.selectbox('Domain', domains, index=0 if not domain_val else domains.index(domain_val))
-    name = st.sidebar.text_input('Name')
-    
-    
+    filter_index = filters.for_contest(contest)
+    selection = sidebar.cascade_filters(filter_index)
+    perf.lap('filters')
     
-    # Filter data based on selections
-    filtered_data = data.copy()
-    if year != 'All':
-        filtered_data = filtered_data[filtered_data['Year'] == year]
-    if department != 'All':
-        filtered_data = filtered_data[filtered_data['Department'] == department]
-    if domain != 'All':
-        filtered_data = filtered_data[filtered_data['Domain'] == domain]
-    if name:
-        filtered_data = filtered_data[filtered_data['Name'].str.contains(name, case=False)]
-    
-    
-    absentees = filtered_data[filtered_data['Rank']==0].reset_index(drop=True)
-    #absentees.index += 1
-    
-    range = st.sidebar.slider("Select No. of Absentees to be Shown",0,len(absentees), (0,len(absentees)))
-    
-    st.table(absentees[['Name', 'Year', 'Domain', 'Department','Mobile Number']][range[0]:range[1]+1])
+    absentee_table(contest_data, filter_index, selection)
+
+elif chronic:
+    # Across contests, from the students x contests presence bitsets
+    snapshot = history.current()
+    perf.lap('history')
     
-    def convert_df(df):
-        # IMPORTANT: Cache the conversion to prevent computation on every rerun
-        return df.to_csv().encode('utf-8')
+    st.header("Chronic Absentees:")
     
-    csv = convert_df(absentees)
+    # Sidebar layout; students are filtered by their latest Year/Department/Domain
+    filter_index = snapshot.filter_index()
+    selection = sidebar.cascade_filters(filter_index)
+    perf.lap('filters')
     
-    st.download_button(
-        label="Download Absentee data",
-        data=csv,
-        file_name='LeetCode Weekly Contest Absentees.csv',
-        mime='text/csv',
-    )
+    chronic_table(snapshot, filter_index.rows(**selection), selection)
+
+perf.finish()
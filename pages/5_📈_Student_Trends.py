@@ -0,0 +1,65 @@
+import streamlit as st
+
+from dashboard import figures, history, perf, sidebar
+
+
+@perf.fragment
+def student_trajectory(snapshot, cohort_rows, last):
+    # Reruns on its own for a new search or student; the cohort charts below stay put.
+    query = st.text_input("Find Student", help='Name, username or registration number.')
+    if query:
+        st.subheader("Student Trajectory")
+        matches = snapshot.search_index().rows(query, within=cohort_rows)
+        if len(matches):
+            students = snapshot.students
+            student = st.selectbox('Student', matches[:100].tolist(),
+                                   format_func=lambda row: f"{students['Name'][row]} ({students['Username'][row]})")
+            trajectory = snapshot.trajectory(student, last)
+            attended = trajectory[trajectory['Present']]
+            
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Contests Attended", f"{len(attended)} / {len(trajectory)}")
+            col2.metric("Best Rank", attended['Rank'].min() if len(attended) else '-')
+            col3.metric("Latest Rank", attended['Rank'].iloc[-1] if len(attended) else '-')
+            
+            if len(attended):
+                st.plotly_chart(figures.rank_trend(trajectory))
+            st.table(trajectory.drop(columns='Present').set_index('Contest'))
+        else:
+            st.info("No student matches the search and filters.")
+        st.divider()
+
+perf.start('Student Trends')
+st.header("Student Trends:")
+
+# Every contest on disk, joined per student
+sidebar.watch_contests()
+snapshot = history.current()
+perf.lap('history')
+
+if snapshot.contests:
+    st.sidebar.header("Contests")
+    last = st.sidebar.number_input("Last N Contests", min_value=1, max_value=len(snapshot.contests),
+                                   value=min(12, len(snapshot.contests)), step=1)
+    
+    # Sidebar layout; students are filtered by their latest Year/Department/Domain
+    filter_index = snapshot.filter_index()
+    selection = sidebar.cascade_filters(filter_index)
+    cohort_rows = filter_index.rows(**selection)
+    perf.lap('filters')
+    
+    student_trajectory(snapshot, cohort_rows, last)
+    
+    # Cohort trends over the selected contests
+    st.subheader(f"Cohort Trends ({len(cohort_rows)} students)")
+    cohort = snapshot.cohort(cohort_rows, last)
+    perf.lap('cohort')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures.participation_bar(cohort))
+    with col2:
+        st.plotly_chart(figures.median_rank_line(cohort))
+    st.dataframe(cohort.set_index('Contest'))
+    perf.lap('cohort charts')
+
+perf.finish()
@@ -0,0 +1,88 @@
+import streamlit as st
+
+from dashboard import compare, cube, figures, history, perf, sidebar
+
+
+@perf.fragment
+def movers(changes, baseline, newest):
+    # Reruns on its own for a new list length.
+    count = st.number_input("Students per List", min_value=1, max_value=100, value=10, step=1)
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.subheader(f"Most Improved ({baseline} → {newest}):")
+        st.table(changes[changes['Gain'] > 0].nlargest(count, 'Gain').reset_index(drop=True))
+    with col2:
+        st.subheader(f"Most Regressed ({baseline} → {newest}):")
+        st.table(changes[changes['Gain'] < 0].nsmallest(count, 'Gain').reset_index(drop=True))
+
+perf.start('Compare Contests')
+st.header("Compare Contests:")
+
+contests = sidebar.watch_contests()
+names = {contest.name: contest for contest in contests}
+
+# Two newest contests by default; the oldest selected one is the baseline
+chosen = st.sidebar.multiselect("Contests", list(names), default=list(names)[:2])
+chosen = sorted((names[name] for name in chosen), key=lambda contest: contest.date)
+
+if len(chosen) < 2:
+    st.info("Select at least two contests to compare.")
+else:
+    # Filter options cover every chosen contest
+    selection = sidebar.cascade_filters(cube.aggregate(chosen))
+    perf.lap('filters')
+    
+    # One cached cube per contest; everything below is slices and sums of them
+    views = {contest.id: cube.for_contest(contest).select(**selection) for contest in chosen}
+    labels = list(views)
+    baseline = labels[0]
+    
+    metric_cols = st.columns(len(chosen))
+    for metric_col, contest in zip(metric_cols, chosen):
+        view = views[contest.id]
+        delta = None if contest.id == baseline else view.present - views[baseline].present
+        with metric_col:
+            st.metric(contest.name, f"{view.present} / {view.total}", delta, help="Present / listed students")
+    st.caption(f"Changes (Δ) are against {chosen[0].name}.")
+    perf.lap('metrics')
+    
+    st.divider()
+    for dim in ('Department', 'Domain'):
+        st.subheader(f"{dim}-wise Participation:")
+        table = compare.participation(views, dim)
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.plotly_chart(figures.grouped_bar(compare.long_form(table, labels, dim), dim, 'Participants'),
+                            key=f'compare_{dim}')
+        with col2:
+            st.dataframe(table)
+    
+    perf.lap('participation charts')
+    
+    st.divider()
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.subheader("Problems Solved Count")
+        table = compare.prob_counts(views)
+        st.plotly_chart(figures.grouped_bar(compare.long_form(table, labels, 'Problems'), 'Problems', ''),
+                        key='compare_problems')
+        st.dataframe(table)
+    with col2:
+        st.subheader("Rank Range Distribution:")
+        table = compare.rank_bins(views)
+        st.plotly_chart(figures.grouped_bar(compare.long_form(table, labels, 'Rank Range'), 'Rank Range', ''),
+                        key='compare_ranks')
+        st.dataframe(table)
+    
+    perf.lap('problem and rank charts')
+    
+    # Students ranked in both the baseline and the newest chosen contest
+    st.divider()
+    snapshot = history.current()
+    positions = {contest.id: i for i, contest in enumerate(snapshot.contests)}
+    changes = snapshot.rank_change(positions[baseline], positions[labels[-1]],
+                                   snapshot.filter_index().rows(**selection))
+    perf.lap('rank changes')
+    movers(changes, baseline, labels[-1])
+
+perf.finish()
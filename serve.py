@@ -0,0 +1,30 @@
+"""Run the dashboard with its caches warming up before the first visitor.
+
+    python serve.py [--newest 3] [streamlit options, e.g. --server.port 8501]
+
+Equivalent to ``streamlit run 1_📊_Dashboard.py`` except that
+``dashboard.warmup`` starts preloading the newest contests in this process
+first, so the caches it fills are the ones the pages read.
+"""
+import argparse
+import os
+import sys
+
+from streamlit.web import cli
+
+from dashboard import warmup
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), '1_📊_Dashboard.py')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--newest', type=int, default=warmup.NEWEST, help='number of contests to preload')
+    args, streamlit_args = parser.parse_known_args()
+    warmup.start(args.newest)
+    sys.argv = ['streamlit', 'run', DASHBOARD, *streamlit_args]
+    sys.exit(cli.main())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+"""Ingest the tests' contest files into a throwaway cache, not the app's."""
+import os
+import shutil
+import tempfile
+
+# Before any dashboard module reads it.
+CACHE_DIR = os.environ['CONTEST_CACHE_DIR'] = tempfile.mkdtemp(prefix='contest-tests-')
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,45 @@
+"""Attendance bitsets against the same queries on the boolean matrices."""
+import numpy as np
+import pytest
+
+from dashboard.attendance import Attendance
+
+
+def _matrices(seed):
+    rng = np.random.default_rng(seed)
+    # Contest counts on both sides of a byte boundary.
+    shape = (int(rng.integers(1, 40)), int(rng.integers(1, 20)))
+    listed = rng.random(shape) < 0.8
+    present = rng.random(shape) < 0.5
+    return listed, present
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_counts_match_brute_force(seed):
+    listed, present = _matrices(seed)
+    presence = Attendance(listed, present)
+    absent = listed & ~present
+    contests = listed.shape[1]
+    for last in [None, 1, 3, 8, contests, contests + 5]:
+        window = slice(max(contests - last, 0) if last else 0, None)
+        assert np.array_equal(presence.absences(last), absent[:, window].sum(axis=1))
+        assert np.array_equal(presence.listings(last), listed[:, window].sum(axis=1))
+        for threshold in [1, 2]:
+            assert np.array_equal(presence.chronic(threshold, last), absent[:, window].sum(axis=1) >= threshold)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_participation_and_streak_match_brute_force(seed):
+    listed, present = _matrices(seed)
+    presence = Attendance(listed, present)
+    took_part = listed & present
+    absent = listed & ~present
+    first, last, streak = [], [], []
+    for row in range(listed.shape[0]):
+        contests = np.flatnonzero(took_part[row])
+        first.append(contests[0] if len(contests) else -1)
+        last.append(contests[-1] if len(contests) else -1)
+        streak.append(absent[row, last[-1] + 1:].sum())
+    assert np.array_equal(presence.first_participation(), first)
+    assert np.array_equal(presence.last_participation(), last)
+    assert np.array_equal(presence.streak(), streak)
@@ -0,0 +1,72 @@
+"""Cube slices and sums against counting the rows directly."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import ingest
+from dashboard.cube import RANK_EDGES, Cube
+
+DEPARTMENTS = ['CSE', 'ECE', 'IT', 'AIDS']
+
+
+def _frame(rng, size, departments=DEPARTMENTS):
+    rank = rng.integers(1, 40000, size)
+    # Ranks on the bin edges themselves, and absentees.
+    rank = np.where(rng.random(size) < 0.2, rng.choice(RANK_EDGES, size=size), rank)
+    return pd.DataFrame({
+        'Year': rng.choice(ingest.YEARS, size=size),
+        'Department': rng.choice(departments, size=size),
+        'Domain': rng.choice(ingest.DOMAINS[:5], size=size),
+        'Rank': np.where(rng.random(size) < 0.4, 0, rank),
+        'ProbCount': rng.integers(0, 5, size),
+    })
+
+
+def _selections(frame):
+    yield {}
+    yield {'year': frame['Year'].iloc[0]}
+    yield {'department': frame['Department'].iloc[0], 'domain': frame['Domain'].iloc[0]}
+    yield {'year': frame['Year'].iloc[0], 'department': frame['Department'].iloc[0],
+           'domain': frame['Domain'].iloc[0]}
+    # A value the contest does not have.
+    yield {'department': 'MECH'}
+
+
+def _rows(frame, year='All', department='All', domain='All'):
+    keep = np.ones(len(frame), dtype=bool)
+    for column, value in [('Year', year), ('Department', department), ('Domain', domain)]:
+        if value != 'All':
+            keep &= (frame[column] == value).to_numpy()
+    return frame[keep]
+
+
+def _assert_matches(cube, frame):
+    for selection in _selections(frame):
+        view, rows = cube.select(**selection), _rows(frame, **selection)
+        present = rows[rows['Rank'] > 0]
+        assert (view.total, view.present, view.absent) == (len(rows), len(present), len(rows) - len(present))
+        for dim in ['Year', 'Department', 'Domain']:
+            expected = rows[dim].value_counts()
+            counts = view.counts_by(dim)
+            assert counts[counts > 0].sort_index().to_dict() == expected.sort_index().to_dict()
+        assert view.prob_counts().tolist() == [int((present['ProbCount'] == p).sum()) for p in range(5)]
+        for edges in [[0] + RANK_EDGES + [None], [0, 1000, 30000]]:
+            bins = [np.inf if edge is None else edge for edge in edges]
+            expected = pd.cut(present['Rank'], bins).value_counts(sort=False).tolist()
+            assert view.rank_bins(edges, list(range(len(edges) - 1))).tolist() == expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_select_matches_counting_rows(seed):
+    rng = np.random.default_rng(seed)
+    frame = _frame(rng, int(rng.integers(1, 500)))
+    _assert_matches(Cube.from_frame(frame), frame)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_sum_matches_cube_of_concatenated_rows(seed):
+    rng = np.random.default_rng(seed)
+    # Contests whose Department labels only partly overlap.
+    frames = [_frame(rng, int(rng.integers(1, 300)), DEPARTMENTS[i:i + 3]) for i in range(2)]
+    total = Cube.from_frame(frames[0]) + Cube.from_frame(frames[1])
+    _assert_matches(total, pd.concat(frames, ignore_index=True))
@@ -0,0 +1,55 @@
+"""Ranking pages, the resume checkpoint and merging the ranking into a roster."""
+import pandas as pd
+
+from dashboard import ingest
+from dashboard.fetch import Checkpoint, merge, parse_page, slug
+
+
+def test_slug():
+    assert slug('w412') == 'weekly-contest-412'
+    assert slug('bw136') == 'biweekly-contest-136'
+
+
+def test_parse_page():
+    payload = {
+        'user_num': 2,
+        'total_rank': [{'username': 'alice', 'rank': '1', 'score': 18}, {'username': 'Bob', 'rank': 2, 'score': '4'}],
+        'submissions': [{'3243': {}, '3244': {}, '3245': {}}, {}],
+    }
+    assert parse_page(payload) == [['alice', 1, 18, 3], ['Bob', 2, 4, 0]]
+    # Pages without submissions count no problems.
+    del payload['submissions']
+    assert parse_page(payload) == [['alice', 1, 18, 0], ['Bob', 2, 4, 0]]
+
+
+def test_checkpoint_resumes(tmp_path):
+    path = str(tmp_path / '.w412.fetch.jsonl')
+    checkpoint = Checkpoint(path)
+    assert checkpoint.pages == {} and checkpoint.page_count is None
+    checkpoint.set_page_count(3)
+    checkpoint.add(1, [['alice', 1, 18, 3]])
+    checkpoint.add(3, [['carol', 51, 3, 1]])
+    checkpoint.set_page_count(3)
+    checkpoint.close()
+    # A run killed halfway through writing a page.
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('{"page": 2, "rows": [["bo')
+
+    resumed = Checkpoint(path)
+    assert resumed.page_count == 3
+    assert resumed.pages == {1: [['alice', 1, 18, 3]], 3: [['carol', 51, 3, 1]]}
+    resumed.add(2, [['bob', 26, 7, 2]])
+    resumed.close()
+    # The torn line is gone rather than continued by the next record.
+    again = Checkpoint(path)
+    assert sorted(again.pages) == [1, 2, 3]
+    again.close()
+    with open(path, encoding='utf-8') as file:
+        assert sum('page_count' in line for line in file) == 1
+
+
+def test_merge():
+    roster = pd.DataFrame({'Name': ['A', 'B', 'C'], 'Username': ['Alice', 'bob', None]})
+    frame = merge(roster, [['alice', 7, 12, 2], ['dave', 1, 18, 4]])
+    assert list(frame.columns) == ingest.COLUMNS
+    assert frame[ingest.NUMERIC_COLUMNS].values.tolist() == [[7, 12, 2], [0, 0, 0], [0, 0, 0]]
@@ -0,0 +1,51 @@
+"""The filter bitmaps against masking the frame directly."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.filters import FIELDS, KEYS, FilterIndex
+
+
+def _frame(rng, size):
+    return pd.DataFrame({
+        'Year': rng.choice(['I', 'II', 'III', 'IV'], size=size),
+        'Department': rng.choice(['CSE', 'ECE', 'IT', 'MECH', 'EEE'], size=size),
+        'Domain': rng.choice(['SDE', 'Cloud', 'IoT'], size=size),
+    })
+
+
+def _mask(frame, selection):
+    keep = np.ones(len(frame), dtype=bool)
+    for field in FIELDS:
+        value = selection.get(KEYS[field], 'All')
+        if value != 'All':
+            keep &= (frame[field] == value).to_numpy()
+    return keep
+
+
+def _selections(frame, rng):
+    yield {}
+    # A value the contest does not have.
+    yield {'department': 'CIVIL'}
+    for _ in range(10):
+        row = frame.iloc[int(rng.integers(len(frame)))]
+        yield {KEYS[field]: row[field] if rng.random() < 0.6 else 'All' for field in FIELDS}
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_rows_and_options_match_masking(seed):
+    rng = np.random.default_rng(seed)
+    # Sizes on both sides of a byte boundary.
+    frame = _frame(rng, int(rng.integers(1, 100)))
+    index = FilterIndex(frame)
+    for selection in _selections(frame, rng):
+        keep = _mask(frame, selection)
+        assert np.array_equal(index.rows(**selection), np.flatnonzero(keep))
+        assert index.count(**selection) == keep.sum()
+        for field in FIELDS:
+            # A field's own selection does not narrow its options.
+            others = {key: value for key, value in selection.items() if key != KEYS[field]}
+            still = set(frame[field][_mask(frame, others)])
+            # In order of first appearance in the contest.
+            expected = [value for value in pd.unique(frame[field]) if value in still]
+            assert index.options(field, **selection) == ['All'] + expected
@@ -0,0 +1,152 @@
+"""History's vectorized student matching against matching the rows one by one."""
+import datetime
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import history
+
+MEASURES = list(history.MEASURES)
+
+
+def _frame(rng, size):
+    def labels(prefix, count, missing):
+        return pd.array([f'{prefix}{x}' if rng.random() > missing else None
+                         for x in rng.integers(0, count, size)], dtype='string')
+    # Few distinct values, so Reg Numbers and Usernames collide across rows and
+    # contests; Usernames in either case, both keys sometimes missing.
+    users = labels('u', 30, 0.15)
+    users = pd.array([user.upper() if not pd.isna(user) and rng.random() < 0.3 else user
+                      for user in users], dtype='string')
+    frame = pd.DataFrame({
+        'Name': labels('N', 10, 0.2),
+        'Reg Number': labels('R', 30, 0.25),
+        'Username': users,
+        'Year': labels('Y', 3, 0.1),
+        'Department': labels('D', 3, 0),
+        'Domain': labels('X', 3, 0),
+        'Rank': rng.integers(0, 100, size),
+        'Score': rng.integers(0, 20, size),
+        'ProbCount': rng.integers(0, 5, size),
+    })
+    # Ingest leaves Reg Numbers unique within a contest.
+    regs = frame['Reg Number']
+    return frame[~(regs.duplicated() & regs.notna())].reset_index(drop=True)
+
+
+def _match(frames):
+    """Students, listed and measure matrices from matching row by row."""
+    regs, users, students, cells = {}, {}, [], {}
+    for contest, frame in enumerate(frames):
+        for row in frame.to_dict('records'):
+            reg = None if pd.isna(row['Reg Number']) else row['Reg Number']
+            user = None if pd.isna(row['Username']) else row['Username'].lower()
+            student = regs.get(reg, users.get(user))
+            if student is None:
+                student = len(students)
+                students.append(dict.fromkeys(history.STUDENT_COLUMNS))
+            if reg is not None:
+                regs.setdefault(reg, student)
+            if user is not None:
+                users.setdefault(user, student)
+            for column in history.STUDENT_COLUMNS:
+                if not pd.isna(row[column]):
+                    students[student][column] = row[column]
+            # A student's first row in a contest is the one kept.
+            cells.setdefault((student, contest), [row[measure] for measure in MEASURES])
+    listed = np.zeros((len(students), len(frames)), dtype=bool)
+    matrices = {measure: np.zeros(listed.shape, dtype=np.int64) for measure in MEASURES}
+    for (student, contest), values in cells.items():
+        listed[student, contest] = True
+        for measure, value in zip(MEASURES, values):
+            matrices[measure][student, contest] = value
+    return pd.DataFrame(students, columns=history.STUDENT_COLUMNS, dtype='string'), listed, matrices
+
+
+@pytest.fixture
+def contests(monkeypatch):
+    """Contests a week apart whose rows ``store.read`` serves from ``frames``."""
+    frames = {}
+    monkeypatch.setattr(history.store, 'read', lambda contest_id, columns=None: frames[contest_id].copy())
+    monkeypatch.setattr(history.registry, 'version', lambda contest: contest.version)
+
+    def make(rows):
+        frames.update((str(i), frame) for i, frame in enumerate(rows))
+        first = datetime.date(2024, 1, 7)
+        return [types.SimpleNamespace(id=str(i), version=0, date=first + datetime.timedelta(weeks=i))
+                for i in range(len(rows))]
+    return make
+
+
+def _assert_matches(snapshot, frames):
+    students, listed, matrices = _match(frames)
+    pd.testing.assert_frame_equal(snapshot.students, students)
+    assert np.array_equal(snapshot.listed, listed)
+    for measure in MEASURES:
+        assert np.array_equal(snapshot.matrices[measure], matrices[measure]), measure
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_resolve_matches_row_by_row(contests, seed):
+    rng = np.random.default_rng(seed)
+    frames = [_frame(rng, int(rng.integers(0, 60))) for _ in range(int(rng.integers(1, 6)))]
+    _assert_matches(history.History().sync(contests(frames)), frames)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_contests_added_one_at_a_time(contests, seed):
+    rng = np.random.default_rng(seed)
+    frames = [_frame(rng, int(rng.integers(1, 60))) for _ in range(5)]
+    listing = contests(frames)
+    shared = history.History()
+    for count in range(1, len(frames) + 1):
+        # In any order: the history sorts them by date.
+        snapshot = shared.sync(listing[:count][::-1])
+        _assert_matches(snapshot, frames[:count])
+    assert snapshot is shared.sync(listing)
+
+
+def test_conflicting_aliases(contests):
+    frames = [
+        pd.DataFrame({'Reg Number': ['R1', 'R2'], 'Username': ['alice', 'bob']}),
+        # R1 now comes with bob's Username: the Reg Number wins, and the
+        # Username matches bob's row, in any case, when the Reg Number is missing.
+        pd.DataFrame({'Reg Number': ['R1', None], 'Username': ['Bob', 'BOB']}),
+        # A new Reg Number under a known Username joins that student.
+        pd.DataFrame({'Reg Number': ['R3'], 'Username': ['bob']}),
+    ]
+    snapshot = _sync(contests, frames)
+    assert snapshot.listed.tolist() == [[True, True, False], [True, True, True]]
+    # Details come from the latest listing.
+    assert snapshot.students['Username'].tolist() == ['Bob', 'bob']
+    _assert_matches(snapshot, frames)
+
+
+def test_duplicate_usernames_in_one_contest(contests):
+    frames = [pd.DataFrame({'Reg Number': ['R1', 'R2', None], 'Username': ['carol', 'Carol', 'CAROL'],
+                            'Rank': [5, 7, 9]})]
+    snapshot = _sync(contests, frames)
+    assert len(snapshot.students) == 1
+    assert snapshot.matrices['Rank'].tolist() == [[5]]
+    _assert_matches(snapshot, frames)
+
+
+def test_rows_without_either_key_are_separate_students(contests):
+    frames = [pd.DataFrame({'Reg Number': [None, None], 'Username': [None, None], 'Rank': [3, 4]}),
+              pd.DataFrame({'Reg Number': [None], 'Username': [None], 'Rank': [5]})]
+    snapshot = _sync(contests, frames)
+    assert snapshot.listed.tolist() == [[True, False], [True, False], [False, True]]
+    _assert_matches(snapshot, frames)
+
+
+def _sync(contests, frames):
+    # Fill in the columns a test does not care about.
+    for frame in frames:
+        for column in history.COLUMNS:
+            if column not in frame:
+                frame[column] = 0 if column in history.MEASURES else 'x'
+            if column not in history.MEASURES:
+                frame[column] = frame[column].astype('string')
+    return history.History().sync(contests(frames))
@@ -0,0 +1,99 @@
+"""Normalizing the contest exports onto the canonical schema."""
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import ingest, registry, store
+
+
+def _raw(**columns):
+    rows = len(next(iter(columns.values())))
+    frame = {
+        'Name': [f'Student {i}' for i in range(rows)],
+        'Reg Number': [f'23CS{i:03d}' for i in range(rows)],
+        'Username': [f'user{i}' for i in range(rows)],
+        'Year': ['II'] * rows,
+        'Department': ['CSE'] * rows,
+        'Domain': ['SDE'] * rows,
+        'Rank': [i + 1 for i in range(rows)],
+        'Score': [3] * rows,
+        'ProbCount': [1] * rows,
+    }
+    frame.update(columns)
+    return pd.DataFrame(frame)
+
+
+def test_missing_required_columns():
+    with pytest.raises(ValueError, match='Rank, Score'):
+        ingest.normalize(_raw(Name=['A']).drop(columns=['Rank', 'Score']))
+
+
+def test_canonical_columns_and_types():
+    raw = _raw(Rank=['12', None, 'n/a'], Score=[4.0, None, 2.0], ProbCount=['1', '0', None])
+    # Exports with a BOM carry it on the first header.
+    clean = ingest.normalize(raw.rename(columns={'Name': '﻿Name '}))
+    assert list(clean.columns) == ingest.COLUMNS
+    for column in ingest.NUMERIC_COLUMNS:
+        assert clean[column].dtype == np.int64
+    assert clean['Rank'].tolist() == [12, 0, 0]
+    assert clean['Score'].tolist() == [4, 0, 2]
+    assert clean['ProbCount'].tolist() == [1, 0, 0]
+    # Optional columns the export lacks are there, empty.
+    assert clean['Mail ID'].isna().all()
+
+
+def test_values_are_canonical():
+    clean = ingest.normalize(_raw(
+        Year=['II year', '3', 'iv YEAR', 'V'],
+        Domain=['full stak', 'Cloud,Fullstack', ' FullStack Development ', 'Quantum'],
+        Department=['Cyber Security', 'CSE', 'left empty so replaced', ' ECE '],
+        **{'Reg Number': ['23cs001', '2.10E+11', ' ', '23CS004']},
+    ))
+    assert clean['Year'].tolist() == ['II', 'III', 'IV', ingest.UNKNOWN]
+    assert clean['Domain'].tolist() == ['Full Stack', 'Cloud', 'Full Stack', 'Other']
+    assert clean['Department'].tolist() == ['CSE (CS)', 'CSE', ingest.UNKNOWN, 'ECE']
+    assert clean['Reg Number'].tolist()[::3] == ['23CS001', '23CS004']
+    assert clean['Reg Number'].iloc[1:3].isna().all()
+
+
+def test_one_row_per_student_preferring_a_ranked_row():
+    clean = ingest.normalize(_raw(
+        Name=['absent', 'ranked', 'other', 'same user'],
+        Rank=[0, 7, 9, 3],
+        # The first two share a Reg Number; the last has a mangled one but the
+        # Username of the third, in another case.
+        **{'Reg Number': ['23CS001', '23cs001', None, '2.1E+11'],
+           'Username': ['a', 'b', 'Carol', 'carol']},
+    ))
+    assert clean['Name'].tolist() == ['ranked', 'other']
+    assert clean['Rank'].tolist() == [7, 9]
+
+
+def test_rows_without_reg_number_or_username_are_kept():
+    clean = ingest.normalize(_raw(
+        Name=['A', 'B', 'C'],
+        **{'Reg Number': [None, '2.1E+11', '23CS003'], 'Username': [' ', None, 'c']},
+    ))
+    # Nothing identifies the first two, so neither is a duplicate of the other.
+    assert clean['Name'].tolist() == ['A', 'B', 'C']
+
+
+def test_ensure_reingests_whenever_the_file_changes(tmp_path):
+    path = tmp_path / 'w901.csv'
+    contest = registry.Contest(id='w901', kind='w', number=901, date=datetime.date(2031, 10, 19),
+                               path=str(path))
+
+    def export(names, mtime_ns):
+        _raw(Name=names).to_csv(path, index=False)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        ingest.ensure(contest)
+        return store.read(contest.id, columns=['Name'])['Name'].tolist()
+
+    now = os.stat(tmp_path).st_mtime_ns
+    assert export(['A', 'B'], now) == ['A', 'B']
+    # An older copy put back, and one with the same mtime but another size.
+    assert export(['C', 'D'], now - 10**9) == ['C', 'D']
+    assert export(['EE', 'F'], now - 10**9) == ['EE', 'F']
@@ -0,0 +1,42 @@
+"""Finding the contest files and naming and dating them."""
+import datetime
+
+import pytest
+
+from dashboard import registry
+
+HEADER = 'Name,Reg Number,Username,Year,Department,Domain,Rank,Score,ProbCount\n'
+
+
+def _contest_file(path, rows=1):
+    path.write_text(HEADER + ''.join(f'S{i},23CS{i:03d},user{i},II,CSE,SDE,{i + 1},3,1\n'
+                                     for i in range(rows)))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in ['w412.csv', 'w413.csv', 'bw136.csv', 'bw137.csv']:
+        _contest_file(tmp_path / name)
+    # Not contest files.
+    for name in ['roster.csv', 'w414.csv.bak', 'x415.csv', 'w416.txt']:
+        _contest_file(tmp_path / name)
+    (tmp_path / 'w417.csv').mkdir()
+    return str(tmp_path)
+
+
+def test_discover_newest_first(data_dir):
+    contests = registry.discover(data_dir)
+    assert [contest.id for contest in contests] == ['w413', 'w412', 'bw137', 'bw136']
+    assert [contest.date for contest in contests] == [
+        datetime.date(2024, 9, 1), datetime.date(2024, 8, 25),
+        datetime.date(2024, 8, 17), datetime.date(2024, 8, 3)]
+    assert contests[0].name == 'Leetcode Weekly Contest - 413 [01.09.2024]'
+    assert contests[-1].name == 'Leetcode Biweekly Contest - 136 [03.08.2024]'
+
+
+def test_get_by_id_or_name(data_dir):
+    contest = registry.get('bw137', data_dir)
+    assert contest.number == 137 and contest.kind == 'bw'
+    assert registry.get(contest.name, data_dir) == contest
+    with pytest.raises(KeyError):
+        registry.get('w414', data_dir)
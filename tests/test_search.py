@@ -0,0 +1,42 @@
+"""The n-gram search index against a substring scan of every row."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.search import FIELDS, SearchIndex, normalize
+
+ALPHABET = list('abcAB1 -é') + ['\t', '  ']
+
+
+def _frame(rng, size):
+    def cell():
+        if rng.random() < 0.1:
+            return None
+        return ''.join(rng.choice(ALPHABET, size=int(rng.integers(0, 8))))
+    return pd.DataFrame({field: pd.array([cell() for _ in range(size)], dtype='string') for field in FIELDS})
+
+
+def _scan(frame, query):
+    query = normalize(query)
+    fields = [frame[field].fillna('').map(normalize) for field in FIELDS]
+    return np.array([row for row in range(len(frame))
+                     if any(query in values.iloc[row] for values in fields)], dtype=np.int32)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_rows_match_substring_scan(seed):
+    rng = np.random.default_rng(seed)
+    frame = _frame(rng, int(rng.integers(0, 80)))
+    index = SearchIndex(frame)
+    queries = ['', ' ', 'a', 'AB', 'b a', 'zz', 'ab1-é']
+    queries += [''.join(rng.choice(ALPHABET, size=int(rng.integers(1, 7)))) for _ in range(20)]
+    within = np.sort(rng.choice(len(frame), size=len(frame) // 2, replace=False)).astype(np.int32)
+    for query in queries:
+        expected = _scan(frame, query)
+        assert np.array_equal(index.rows(query), expected), query
+        assert np.array_equal(index.rows(query, within=within), np.intersect1d(expected, within)), query
+
+
+def test_match_does_not_span_fields():
+    frame = pd.DataFrame({'Name': ['ab'], 'Username': ['cd'], 'Reg Number': ['ef']})
+    assert len(SearchIndex(frame).rows('bc')) == 0
@@ -0,0 +1,33 @@
+"""Top-K from the presorted rank order against sorting each selection."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.topk import TopK
+
+
+def _ranked(rank, rows):
+    # Participants among ``rows`` by rank, ties in row order.
+    rows = np.sort(rows)
+    rows = rows[rank[rows] > 0]
+    return rows[np.argsort(rank[rows], kind='stable')]
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_top_matches_sorting_the_selection(seed):
+    rng = np.random.default_rng(seed)
+    size = int(rng.integers(0, 200))
+    # Absentees (rank 0) and ties included.
+    rank = rng.integers(0, 60, size)
+    index = TopK(pd.DataFrame({'Rank': rank}))
+    for rows in [None, rng.choice(size, size=int(rng.integers(0, size + 1)), replace=False)]:
+        expected = _ranked(rank, np.arange(size) if rows is None else rows)
+        assert np.array_equal(index.ranked(rows), expected)
+        assert index.count(rows) == len(expected)
+        for k in [0, 1, 10, size + 1]:
+            assert np.array_equal(index.top(k, rows), expected[:k])
+            assert np.array_equal(index.top(k, rows, page=2, page_size=3), expected[:k][3:6])
+        positions = np.zeros(size, dtype=np.int32)
+        positions[expected] = np.arange(1, len(expected) + 1)
+        of = rng.integers(0, max(size, 1), 10) if size else np.array([], dtype=np.intp)
+        assert np.array_equal(index.positions(of, rows), positions[of])